@@ -9,5 +9,6 @@ python manage.py collectstatic --noinput
 
 echo "Applying database migrations..."
 python manage.py migrate
+python manage.py migrate --database news_db
 
 echo "Build completed successfully."
@@ -1,4 +1,9 @@
 from django.contrib import admin
-from .models import Review
+from .models import Review, Prediction, ShadowSample, ShadowPrediction, NewsArticle, Source
 
 admin.site.register(Review)
+admin.site.register(Prediction)
+admin.site.register(ShadowSample)
+admin.site.register(ShadowPrediction)
+admin.site.register(NewsArticle)
+admin.site.register(Source)
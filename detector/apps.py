@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
 
 
 class DetectorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'detector'
+
+    def ready(self):
+        from .sqlite_tuning import configure_sqlite_connection
+        from .shadow import release_deferred
+
+        connection_created.connect(configure_sqlite_connection, dispatch_uid="detector.sqlite_tuning")
+        request_finished.connect(release_deferred, dispatch_uid="detector.shadow")
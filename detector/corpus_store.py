@@ -0,0 +1,69 @@
+import numpy as np
+from sklearn.preprocessing import normalize
+
+
+class CompactCorpus:
+    """
+    Read-only view of the training corpus for the request path.
+
+    Keeps only what find_closest needs: article URLs packed into one UTF-8
+    buffer with an offset array, labels as uint8 codes, and the L2-normalized
+    TF-IDF rows (float32, which is plenty for an argmax). Raw and cleaned
+    text are not kept in memory.
+    """
+
+    def __init__(self, url_buffer, url_offsets, label_codes, label_names, vectors):
+        self.url_buffer = url_buffer
+        self.url_offsets = url_offsets
+        self.label_codes = label_codes
+        self.label_names = label_names
+        self.vectors = vectors
+
+    @classmethod
+    def build(cls, urls, labels, vectors):
+        encoded = [(url or "").encode("utf-8") for url in urls]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(url) for url in encoded], out=offsets[1:])
+
+        label_names = tuple(sorted({str(label) for label in labels}))
+        lookup = {name: code for code, name in enumerate(label_names)}
+        codes = np.fromiter((lookup[str(label)] for label in labels), dtype=np.uint8, count=len(encoded))
+
+        vectors = normalize(vectors.tocsr()).astype(np.float32)
+        return cls(b"".join(encoded), offsets, codes, label_names, vectors)
+
+    @classmethod
+    def from_dataframe(cls, df, vectorizer):
+        """
+        Convert the (text, label, article_url, cleaned_text) DataFrame stored in
+        older artifacts.
+        """
+        vectors = vectorizer.transform(df["cleaned_text"])
+        return cls.build(df["article_url"].tolist(), df["label"].tolist(), vectors)
+
+    def __len__(self):
+        return len(self.label_codes)
+
+    @property
+    def nbytes(self):
+        return (
+            len(self.url_buffer) + self.url_offsets.nbytes + self.label_codes.nbytes
+            + self.vectors.data.nbytes + self.vectors.indices.nbytes + self.vectors.indptr.nbytes
+        )
+
+    def url(self, idx):
+        return self.url_buffer[self.url_offsets[idx]:self.url_offsets[idx + 1]].decode("utf-8")
+
+    def label(self, idx):
+        return self.label_names[self.label_codes[idx]]
+
+    def row(self, idx):
+        return {"article_url": self.url(idx), "label": self.label(idx)}
+
+    def closest(self, input_vec):
+        """
+        Index of the row with the highest cosine similarity to ``input_vec``.
+        Rows are unit length, so a sparse dot product is enough.
+        """
+        sim = (self.vectors @ input_vec.T).toarray().ravel()
+        return int(sim.argmax())
@@ -4,45 +4,41 @@ class NewsRouter:
     Specifically, it routes news-related models to 'news_db' and everything else to 'default'.
     """
 
-    route_app_labels = {'detector'}  # all models in 'detector' app go to news_db
+    route_app_labels = {'detector'}
+    news_model_names = {'newsarticle', 'source'}  # the scraped corpus and its scrape schedule live in news_db
+
+    def _is_news_model(self, app_label, model_name):
+        return app_label in self.route_app_labels and model_name in self.news_model_names
 
     def db_for_read(self, model, **hints):
         """
-        Attempts to read detector models go to news_db.
+        Attempts to read news models go to news_db.
         """
-        if model._meta.app_label in self.route_app_labels:
+        if self._is_news_model(model._meta.app_label, model._meta.model_name):
             return 'news_db'
         return 'default'
 
     def db_for_write(self, model, **hints):
         """
-        Attempts to write detector models go to news_db.
+        Attempts to write news models go to news_db.
         """
-        if model._meta.app_label in self.route_app_labels:
+        if self._is_news_model(model._meta.app_label, model._meta.model_name):
             return 'news_db'
         return 'default'
 
     def allow_relation(self, obj1, obj2, **hints):
         """
-        Allow any relation if both models are in the detector app.
-        """
-        if (
-            obj1._meta.app_label in self.route_app_labels and
-            obj2._meta.app_label in self.route_app_labels
-        ):
-            return True
-        # Allow relations if neither is in detector app
-        elif (
-            obj1._meta.app_label not in self.route_app_labels and
-            obj2._meta.app_label not in self.route_app_labels
-        ):
-            return True
-        return False
+        Allow relations only between models stored in the same database.
+        """
+        return (
+            self._is_news_model(obj1._meta.app_label, obj1._meta.model_name) ==
+            self._is_news_model(obj2._meta.app_label, obj2._meta.model_name)
+        )
 
     def allow_migrate(self, db, app_label, model_name=None, **hints):
         """
-        Ensure detector app only appears in the news_db database.
+        Ensure news models only appear in news_db, and everything else only in default.
         """
-        if app_label in self.route_app_labels:
+        if self._is_news_model(app_label, model_name):
             return db == 'news_db'
         return db == 'default'
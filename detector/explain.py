@@ -0,0 +1,85 @@
+import numpy as np
+
+SURROGATE_C = 10.0
+TOP_PHRASES = 3
+
+REASON_TEMPLATES = {
+    "FAKE": "Wording typical of debunked claims: {phrases}.",
+    "REAL": "Wording typical of reporting from established outlets: {phrases}.",
+}
+
+
+def feature_names(vectorizer):
+    """
+    Output feature names of a fitted vectorizer or feature Pipeline, or None
+    when features are hashed and have no names.
+    """
+    try:
+        return np.asarray(vectorizer.get_feature_names_out(), dtype=object)
+    except (AttributeError, ValueError):
+        return None
+
+
+class Explainer:
+    """
+    Per-feature contribution table for the classifier.
+
+    The SVC's RBF kernel has no per-feature weights, so a logistic regression
+    is fit to the SVC's own predictions on the training matrix (a linear
+    surrogate) and its coefficients are kept. A request's contributions are
+    then tfidf value * weight over the input's non-zero features only.
+    ``fidelity`` is the surrogate's agreement with the labels it was fit to.
+    """
+
+    def __init__(self, weights, names, classes, fidelity):
+        self.weights = weights
+        self.names = names
+        self.classes = classes
+        self.fidelity = fidelity
+
+    @classmethod
+    def fit(cls, vectorizer, X, y):
+        """
+        Fit the surrogate on feature matrix ``X`` to mimic labels ``y``
+        (normally ``model.predict(X)``).
+        """
+        from sklearn.linear_model import LogisticRegression
+
+        names = feature_names(vectorizer)
+        if names is None:
+            return None
+
+        if len(set(y)) < 2:
+            return None
+
+        surrogate = LogisticRegression(C=SURROGATE_C, max_iter=2000, class_weight="balanced")
+        surrogate.fit(X, y)
+
+        return cls(
+            weights=surrogate.coef_[0].astype(np.float32),
+            names=names,
+            classes=tuple(str(label).upper() for label in surrogate.classes_),
+            fidelity=float((surrogate.predict(X) == y).mean()),
+        )
+
+    def top_phrases(self, input_vec, label, k=TOP_PHRASES):
+        """
+        The ``k`` input n-grams that push hardest towards ``label``.
+        """
+        row = input_vec.tocsr()
+        if row.nnz == 0:
+            return []
+
+        # Positive weights favour classes[1]; flip them for classes[0].
+        sign = 1.0 if label.upper() == self.classes[1] else -1.0
+        contributions = sign * row.data * self.weights[row.indices]
+
+        order = np.argsort(contributions)[::-1][:k]
+        return [self.names[row.indices[i]] for i in order if contributions[i] > 0]
+
+    def reason(self, input_vec, label):
+        phrases = self.top_phrases(input_vec, label)
+        template = REASON_TEMPLATES.get(label.upper())
+        if not phrases or template is None:
+            return ""
+        return template.format(phrases=", ".join(f'"{phrase}"' for phrase in phrases))
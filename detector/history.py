@@ -0,0 +1,89 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from .models import Prediction
+from .model_training import preprocess_text, get_model_version
+from .write_behind import WriteBehindBuffer
+
+RECENT_CACHE_SIZE = 1024
+
+_buffer = WriteBehindBuffer.from_settings(Prediction)
+
+# Results recorded by this worker that may not have reached SQLite yet.
+_recent = OrderedDict()
+_recent_lock = threading.Lock()
+
+
+# NORMALIZE + HASH
+def normalize_text(text):
+    return re.sub(r"\s+", " ", preprocess_text(text)).strip()
+
+def text_hash(normalized):
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def _as_result(prediction):
+    return {
+        "label": prediction.label,
+        "confidence": prediction.confidence,
+        "reason": prediction.reason,
+        "source": prediction.source,
+        "article_url": prediction.article_url,
+    }
+
+
+# LOOKUP
+def lookup(text):
+    """
+    Return the stored result for this text under the current model version,
+    or None if it has not been predicted before.
+    """
+    version = get_model_version()
+    key = (text_hash(normalize_text(text)), version)
+
+    with _recent_lock:
+        if key in _recent:
+            _recent.move_to_end(key)
+            return dict(_recent[key])
+
+    prediction = (
+        Prediction.objects
+        .filter(text_hash=key[0], model_version=version)
+        .order_by("-created_at")
+        .first()
+    )
+    if prediction is None:
+        return None
+
+    result = _as_result(prediction)
+    _remember(key, result)
+    return dict(result)
+
+
+# RECORD
+def record(text, result, latency_ms):
+    normalized = normalize_text(text)
+    prediction = Prediction(
+        text_hash=text_hash(normalized),
+        normalized_text=normalized,
+        label=result.get("label", ""),
+        confidence=float(result.get("confidence", 0)),
+        reason=result.get("reason", ""),
+        source=result.get("source", ""),
+        article_url=result.get("article_url", ""),
+        model_version=get_model_version(),
+        latency_ms=latency_ms,
+    )
+    _remember((prediction.text_hash, prediction.model_version), _as_result(prediction))
+    _buffer.put(prediction)
+
+def _remember(key, result):
+    with _recent_lock:
+        _recent[key] = result
+        _recent.move_to_end(key)
+        while len(_recent) > RECENT_CACHE_SIZE:
+            _recent.popitem(last=False)
+
+def flush():
+    _buffer.flush()
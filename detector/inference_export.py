@@ -0,0 +1,169 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.pipeline import Pipeline
+
+# libsvm clips pairwise probabilities to [MIN_PROB, 1 - MIN_PROB]
+MIN_PROB = 1e-7
+
+
+def resolve_gamma(model, X=None):
+    """
+    The kernel coefficient a fitted SVC used, from its public ``gamma``
+    parameter. "scale" depends on the training matrix, so it needs ``X``.
+    """
+    gamma = model.gamma
+    if gamma == "auto":
+        return 1.0 / model.n_features_in_
+    if gamma != "scale":
+        return float(gamma)
+    if X is None:
+        raise ValueError("gamma='scale' was resolved from the training matrix; pass X to recover it")
+
+    # sklearn's formula: 1 / (n_features * X.var()), over every entry of X
+    if sp.issparse(X):
+        variance = X.multiply(X).mean() - X.mean() ** 2
+    else:
+        variance = np.asarray(X).var()
+    return 1.0 / (X.shape[1] * variance) if variance != 0 else 1.0
+
+
+class CompactSVC:
+    """
+    Inference-only replacement for a fitted binary sklearn SVC (rbf or
+    linear kernel). Support vectors are a float32 CSR matrix with near-zero
+    entries pruned; predict/predict_proba reproduce libsvm's decision
+    values and Platt-scaled probabilities. ``gamma`` is the resolved kernel
+    coefficient; without it, it is worked out from ``X`` (see resolve_gamma).
+    """
+
+    def __init__(self, model, prune_below=1e-6, gamma=None, X=None):
+        if len(model.classes_) != 2:
+            raise ValueError("CompactSVC only supports binary classifiers")
+        if model.kernel not in ("rbf", "linear"):
+            raise ValueError(f"CompactSVC does not support the {model.kernel!r} kernel")
+
+        dual_coef = model.dual_coef_
+        dual_coef = np.asarray(dual_coef.toarray() if sp.issparse(dual_coef) else dual_coef).ravel()
+        support_vectors = sp.csr_matrix(model.support_vectors_, dtype=np.float32)
+
+        # Entries and support vectors too small to move the decision value
+        support_vectors.data[np.abs(support_vectors.data) < prune_below] = 0
+        support_vectors.eliminate_zeros()
+        keep = np.abs(dual_coef) >= prune_below
+        self.pruned_vectors = int((~keep).sum())
+
+        self.support_vectors = support_vectors[keep]
+        self.dual_coef = dual_coef[keep].astype(np.float32)
+        self.sv_sq_norms = np.asarray(self.support_vectors.multiply(self.support_vectors).sum(axis=1),
+                                      dtype=np.float32).ravel()
+        self.intercept = float(np.ravel(model.intercept_)[0])
+        self.kernel = model.kernel
+        self.gamma = float(gamma) if gamma is not None else resolve_gamma(model, X)
+        self.classes_ = model.classes_
+        self.probability = bool(getattr(model, "probability", False))
+        if self.probability:
+            self.prob_a = float(model.probA_[0])
+            self.prob_b = float(model.probB_[0])
+
+    @property
+    def nbytes(self):
+        sv = self.support_vectors
+        return (sv.data.nbytes + sv.indices.nbytes + sv.indptr.nbytes
+                + self.dual_coef.nbytes + self.sv_sq_norms.nbytes)
+
+    def decision_function(self, X):
+        X = sp.csr_matrix(X, dtype=np.float32)
+        dots = (X @ self.support_vectors.T).toarray()
+
+        if self.kernel == "rbf":
+            x_sq = np.asarray(X.multiply(X).sum(axis=1), dtype=np.float32)
+            kernel = np.exp(-self.gamma * (x_sq + self.sv_sq_norms - 2 * dots))
+        else:
+            kernel = dots
+
+        return kernel.astype(np.float64) @ self.dual_coef + self.intercept
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+    def predict_proba(self, X):
+        if not self.probability:
+            raise AttributeError("predict_proba is only available when the SVC was fit with probability=True")
+
+        # libsvm works with the negated binary decision value
+        f = self.prob_a * -self.decision_function(X) + self.prob_b
+        r = np.where(f >= 0, np.exp(-f) / (1 + np.exp(-f)), 1 / (1 + np.exp(f)))
+        r = np.clip(r, MIN_PROB, 1 - MIN_PROB)
+        p = _pairwise_coupling(r)
+        return np.column_stack([p, 1 - p])
+
+
+def _pairwise_coupling(r):
+    """
+    libsvm's multiclass_probability() for k=2, vectorized over samples. It is
+    iterative with a loose stopping rule, so it does not simply return r.
+    """
+    k = 2
+    eps = 0.005 / k
+    q00 = (1 - r) ** 2          # Q[0][0] = r[1][0]^2
+    q11 = r ** 2                # Q[1][1] = r[0][1]^2
+    q01 = -(1 - r) * r          # Q[0][1] = Q[1][0] = -r[1][0] * r[0][1]
+
+    p0 = np.full_like(r, 1.0 / k)
+    p1 = np.full_like(r, 1.0 / k)
+    active = np.ones(r.shape, dtype=bool)
+
+    for _ in range(100):
+        qp0 = q00 * p0 + q01 * p1
+        qp1 = q01 * p0 + q11 * p1
+        pqp = p0 * qp0 + p1 * qp1
+        active &= np.maximum(np.abs(qp0 - pqp), np.abs(qp1 - pqp)) >= eps
+        if not active.any():
+            break
+
+        for q_tt, t in ((q00, 0), (q11, 1)):
+            qp_t = qp0 if t == 0 else qp1
+            diff = np.where(active, (-qp_t + pqp) / q_tt, 0.0)
+            if t == 0:
+                p0 = p0 + diff
+            else:
+                p1 = p1 + diff
+            pqp = (pqp + diff * (diff * q_tt + 2 * qp_t)) / (1 + diff) / (1 + diff)
+            qp0 = (qp0 + diff * (q00 if t == 0 else q01)) / (1 + diff)
+            qp1 = (qp1 + diff * (q01 if t == 0 else q11)) / (1 + diff)
+            p0 = p0 / (1 + diff)
+            p1 = p1 / (1 + diff)
+
+    return p0
+
+
+def vectorizer_to_float32(vectorizer):
+    """
+    Make a fitted vectorizer (or feature Pipeline) emit float32 rows, casting
+    its idf_ weights in place.
+    """
+    steps = [step for _, step in vectorizer.steps] if isinstance(vectorizer, Pipeline) else [vectorizer]
+    for step in steps:
+        if "dtype" in step.get_params():
+            step.set_params(dtype=np.float32)
+        if getattr(step, "idf_", None) is not None:
+            step.idf_ = np.asarray(step.idf_, dtype=np.float32)
+    return vectorizer
+
+
+def export_inference(artifact, source_version, prune_below=1e-6, X=None):
+    """
+    Build the inference-only artifact from a training artifact dict (the
+    vectorizer is converted in place). ``source_version`` is the digest of
+    the training artifact, so stale exports are not served after a retrain.
+    ``X``, the training matrix, is only needed for artifacts saved before
+    the resolved gamma was stored in them.
+    """
+    return {
+        "corpus": artifact["corpus"],
+        "vectorizer": vectorizer_to_float32(artifact["vectorizer"]),
+        "model": CompactSVC(artifact["model"], prune_below=prune_below,
+                            gamma=artifact.get("svc_gamma"), X=X),
+        "explainer": artifact.get("explainer"),
+        "source_version": source_version,
+    }
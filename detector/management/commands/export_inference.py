@@ -0,0 +1,104 @@
+import copy
+import os
+import pickle
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from detector.inference_export import export_inference
+from detector.model_training import (
+    INFERENCE_MODEL_FILE, MODEL_FILE, file_digest, load_artifact, load_dataset, save_artifact,
+)
+
+LATENCY_SAMPLES = 500
+
+
+def model_nbytes(vectorizer, model):
+    """
+    Bytes held by the numeric arrays prediction touches: idf weights plus
+    support vectors and dual coefficients.
+    """
+    idf = getattr(vectorizer, "idf_", None)
+    total = idf.nbytes if idf is not None else 0
+
+    if hasattr(model, "nbytes"):
+        return total + model.nbytes
+
+    sv, dual = model.support_vectors_, model.dual_coef_
+    total += sv.data.nbytes + sv.indices.nbytes + sv.indptr.nbytes
+    total += dual.data.nbytes if hasattr(dual, "indices") else dual.nbytes
+    return total
+
+
+def request_latencies(vectorizer, model, texts):
+    # One request = transform + predict + predict_proba, as in predict_news
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        vec = vectorizer.transform([text])
+        model.predict(vec)
+        model.predict_proba(vec)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies, [50, 99])
+
+
+class Command(BaseCommand):
+    help = (
+        "Export a float32, pruned inference-only copy of model_state.pkl and verify "
+        "it against the original on the full news_table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prune-below", type=float, default=1e-6,
+                            help="Drop support-vector entries and dual coefficients below this magnitude.")
+        parser.add_argument("--tolerance", type=float, default=1e-3,
+                            help="Largest allowed per-class probability difference.")
+        parser.add_argument("--min-agreement", type=float, default=0.999,
+                            help="Smallest allowed fraction of identical labels.")
+        parser.add_argument("--dry-run", action="store_true", help="Verify and report, but do not write.")
+
+    def handle(self, *args, **options):
+        if not os.path.exists(MODEL_FILE):
+            raise CommandError(f"{MODEL_FILE} does not exist; train a model first.")
+
+        original = load_artifact(MODEL_FILE)
+        df = load_dataset()
+        if df.empty:
+            raise CommandError("news_table is empty; nothing to verify against.")
+        texts = df["cleaned_text"].tolist()
+        X = original["vectorizer"].transform(texts)
+
+        # X stands in for the training matrix of artifacts that predate svc_gamma.
+        exported = export_inference(copy.deepcopy(original), file_digest(MODEL_FILE),
+                                    prune_below=options["prune_below"], X=X)
+        self.stdout.write(f"Verifying on {len(texts)} news_table rows...")
+
+        X32 = exported["vectorizer"].transform(texts)
+        agreement = (original["model"].predict(X) == exported["model"].predict(X32)).mean()
+        max_delta = np.abs(original["model"].predict_proba(X) - exported["model"].predict_proba(X32)).max()
+
+        before = model_nbytes(original["vectorizer"], original["model"])
+        after = model_nbytes(exported["vectorizer"], exported["model"])
+        sample = texts[:LATENCY_SAMPLES]
+        p50_before, p99_before = request_latencies(original["vectorizer"], original["model"], sample)
+        p50_after, p99_after = request_latencies(exported["vectorizer"], exported["model"], sample)
+
+        self.stdout.write(f"  label agreement:        {agreement:.4%}")
+        self.stdout.write(f"  max probability delta:  {max_delta:.2e}")
+        self.stdout.write(f"  pruned support vectors: {exported['model'].pruned_vectors}")
+        self.stdout.write(f"  model arrays:           {before / 1024:.0f} KB -> {after / 1024:.0f} KB")
+        self.stdout.write(f"  artifact pickle:        {len(pickle.dumps(original)) / 1024:.0f} KB -> "
+                          f"{len(pickle.dumps(exported)) / 1024:.0f} KB")
+        self.stdout.write(f"  request latency p50:    {p50_before:.2f} ms -> {p50_after:.2f} ms")
+        self.stdout.write(f"  request latency p99:    {p99_before:.2f} ms -> {p99_after:.2f} ms")
+
+        if agreement < options["min_agreement"] or max_delta > options["tolerance"]:
+            raise CommandError("Exported model does not match the original within tolerance; not written.")
+
+        if options["dry_run"]:
+            self.stdout.write("Dry run, nothing written.")
+            return
+
+        save_artifact(exported, INFERENCE_MODEL_FILE)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {INFERENCE_MODEL_FILE}"))
@@ -0,0 +1,81 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Packages that should only load on a prediction or training path.
+ML_PACKAGES = ("sklearn", "pandas", "scipy", "numpy", "joblib")
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_importtime(command_args, env=None):
+    """
+    Run ``manage.py <command_args>`` under ``python -X importtime`` and return
+    (module, self_us, cumulative_us, depth) tuples in import order. ``env``
+    adds environment variables for the child, e.g. SQLITE_PATH.
+    """
+    manage_py = os.path.join(settings.BASE_DIR, "manage.py")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", manage_py, *command_args],
+        capture_output=True,
+        text=True,
+        cwd=settings.BASE_DIR,
+        env={**os.environ, **(env or {})},
+    )
+    if proc.returncode != 0:
+        raise CommandError(f"`manage.py {' '.join(command_args)}` failed:\n{proc.stderr[-2000:]}")
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return imports
+
+
+def ml_modules(imports):
+    return sorted({module for module, *_ in imports if module.split(".")[0] in ML_PACKAGES})
+
+
+class Command(BaseCommand):
+    help = "Summarize `python -X importtime` for a management command (default: check)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("command_args", nargs="*", default=["check"],
+                            help="Command to profile, e.g. `migrate --plan`. Put it after `--`.")
+        parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list.")
+
+    def handle(self, *args, **options):
+        command_args = options["command_args"]
+        imports = run_importtime(command_args)
+
+        total_us = sum(cumulative for _, _, cumulative, depth in imports if depth == 0)
+        by_package = defaultdict(int)
+        for module, self_us, _, _ in imports:
+            by_package[module.split(".")[0]] += self_us
+
+        self.stdout.write(f"manage.py {' '.join(command_args)}: {len(imports)} modules, "
+                          f"{total_us / 1000:.1f} ms total import time\n")
+
+        self.stdout.write(f"Top {options['top']} imports by cumulative time:")
+        for module, _, cumulative, _ in sorted(imports, key=lambda row: -row[2])[:options["top"]]:
+            self.stdout.write(f"  {cumulative / 1000:>8.1f} ms  {module}")
+
+        self.stdout.write(f"\nTop {options['top']} packages by own time:")
+        for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:options["top"]]:
+            self.stdout.write(f"  {self_us / 1000:>8.1f} ms  {package}")
+
+        heavy = ml_modules(imports)
+        if heavy:
+            roots = sorted({module.split(".")[0] for module in heavy})
+            self.stdout.write(self.style.WARNING(
+                f"\nML packages imported ({len(heavy)} modules): {', '.join(roots)}"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS("\nNo ML packages imported."))
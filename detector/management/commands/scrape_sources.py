@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from detector.models import Source
+from detector.scrape_scheduler import WORKERS, next_wakeup, run_cycle, seed_sources
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetch the news sources that are due, store new headlines in news_table and "
+        "reschedule each source from its yield. Use --loop to keep polling."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", action="store_true",
+                            help="Add the built-in real/fake source lists to the sources table first.")
+        parser.add_argument("--loop", action="store_true",
+                            help="Keep running, sleeping until the next source is due.")
+        parser.add_argument("--workers", type=int, default=WORKERS, help="Concurrent page fetches.")
+        parser.add_argument("--limit", type=int, default=None, help="Most sources to fetch per cycle.")
+        parser.add_argument("--max-sleep", type=float, default=300,
+                            help="Longest --loop sleep in seconds, so newly added sources are picked up.")
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            self.stdout.write(f"Seeded {seed_sources()} new sources.")
+        if not Source.objects.filter(enabled=True).exists():
+            raise CommandError("No enabled sources; run with --seed or add some in the admin.")
+
+        while True:
+            self.report(run_cycle(workers=options["workers"], limit=options["limit"]))
+            if not options["loop"]:
+                break
+
+            wakeup = next_wakeup()
+            delay = (wakeup - timezone.now()).total_seconds() if wakeup else options["max_sleep"]
+            time.sleep(min(max(delay, 1.0), options["max_sleep"]))
+
+    def report(self, results):
+        if not results:
+            self.stdout.write("No sources due.")
+            return
+
+        for source, new_count, error in results:
+            if error is not None:
+                self.stderr.write(f"  FAIL {source.url} ({source.consecutive_failures} in a row): {error}")
+            else:
+                self.stdout.write(f"  {new_count:>4} new  {source.url}  next in {source.interval}s")
+        failed = sum(1 for _, _, error in results if error is not None)
+        total_new = sum(new_count for _, new_count, _ in results)
+        self.stdout.write(self.style.SUCCESS(
+            f"Fetched {len(results)} sources ({failed} failed), {total_new} new articles."
+        ))
@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from detector.models import ShadowPrediction
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the shadow (candidate) model with the serving model on sampled live "
+        "requests: agreement, confidence deltas and candidate latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=float, default=24, help="Only samples from the last N hours.")
+        parser.add_argument("--candidate", default=None, help="Only this candidate_version.")
+
+    def handle(self, *args, **options):
+        samples = ShadowPrediction.objects.filter(
+            created_at__gte=timezone.now() - timedelta(hours=options["hours"])
+        )
+        if options["candidate"]:
+            samples = samples.filter(candidate_version=options["candidate"])
+
+        versions = samples.order_by().values_list("primary_version", "candidate_version").distinct()
+        if not versions:
+            self.stdout.write("No shadow samples in this window. Is SHADOW_MODEL['ARTIFACT'] set "
+                              "and manage.py shadow_score running?")
+            return
+
+        for primary_version, candidate_version in versions:
+            rows = list(
+                samples.filter(primary_version=primary_version, candidate_version=candidate_version)
+                .values_list("primary_label", "candidate_label", "agreed", "confidence_delta",
+                             "candidate_latency_ms")
+            )
+            self.report(primary_version, candidate_version, rows)
+
+    def report(self, primary_version, candidate_version, rows):
+        agreed = np.array([row[2] for row in rows])
+        delta = np.array([row[3] for row in rows])
+        latency = np.array([row[4] for row in rows])
+
+        flips = {}
+        for primary_label, candidate_label, is_agreed, _, _ in rows:
+            if not is_agreed:
+                key = f"{primary_label} -> {candidate_label}"
+                flips[key] = flips.get(key, 0) + 1
+
+        self.stdout.write(f"\nserving {primary_version} vs candidate {candidate_version} ({len(rows)} samples)")
+        self.stdout.write(f"  agreement:             {agreed.mean():.2%}")
+        for key, count in sorted(flips.items()):
+            self.stdout.write(f"    {key:<14} {count}")
+        self.stdout.write(f"  confidence delta:      mean {delta.mean():+.2f}  "
+                          f"mean abs {np.abs(delta).mean():.2f}  max abs {np.abs(delta).max():.2f} pts")
+        p50, p99 = np.percentile(latency, [50, 99])
+        self.stdout.write(f"  candidate latency:     p50 {p50:.2f} ms  p99 {p99:.2f} ms")
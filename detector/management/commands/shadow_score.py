@@ -0,0 +1,66 @@
+import logging
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from detector.model_training import file_digest, load_artifact
+from detector.models import ShadowPrediction, ShadowSample
+from detector.shadow import ARTIFACT, score
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Score the live requests sampled by the serving workers with the candidate "
+        "model and store the comparisons for shadow_report. Run one instance, "
+        "with --loop, while SHADOW_MODEL['ARTIFACT'] is set."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--artifact", default=ARTIFACT,
+                            help="Candidate .pkl (default: SHADOW_MODEL['ARTIFACT']).")
+        parser.add_argument("--batch-size", type=int, default=200, help="Samples scored per transaction.")
+        parser.add_argument("--loop", action="store_true", help="Keep waiting for new samples.")
+        parser.add_argument("--sleep", type=float, default=5.0, help="Seconds between polls when idle.")
+
+    def handle(self, *args, **options):
+        path = options["artifact"]
+        if not path or not os.path.exists(path):
+            raise CommandError(f"Candidate artifact {path!r} not found; set SHADOW_MODEL_ARTIFACT or --artifact.")
+
+        artifact = load_artifact(path)
+        version = file_digest(path)
+        self.stdout.write(f"Scoring shadow samples with candidate {version}")
+
+        total = 0
+        while True:
+            scored = self.score_batch(artifact, version, options["batch_size"])
+            total += scored
+            if scored:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Scored {total} samples."))
+
+    def score_batch(self, artifact, version, batch_size):
+        samples = list(ShadowSample.objects.order_by("id")[:batch_size])
+        if not samples:
+            return 0
+
+        results = []
+        for shadow_sample in samples:
+            try:
+                results.append(score(artifact, version, shadow_sample))
+            except Exception:
+                # A sample the candidate cannot score is dropped, not retried forever.
+                logger.exception("Shadow scoring failed for sample %s", shadow_sample.pk)
+
+        with transaction.atomic():
+            ShadowPrediction.objects.bulk_create(results)
+            ShadowSample.objects.filter(id__in=[shadow_sample.pk for shadow_sample in samples]).delete()
+        return len(samples)
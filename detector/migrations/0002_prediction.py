@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-19 01:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detector', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Prediction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_hash', models.CharField(max_length=64)),
+                ('normalized_text', models.TextField()),
+                ('label', models.CharField(max_length=10)),
+                ('confidence', models.FloatField()),
+                ('reason', models.TextField(blank=True, default='')),
+                ('source', models.CharField(blank=True, default='', max_length=200)),
+                ('article_url', models.TextField(blank=True, default='')),
+                ('model_version', models.CharField(max_length=40)),
+                ('latency_ms', models.FloatField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['text_hash', '-created_at'], name='prediction_hash_idx'), models.Index(fields=['created_at'], name='prediction_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,90 @@
+# news_table already exists in ml_artifacts/news.db (created by the scraper
+# scripts), so the model is added to the migration state separately and the
+# table is created or upgraded in place.
+
+from urllib.parse import urlparse
+
+import django.utils.timezone
+from django.db import migrations, models
+
+NEWS_HINTS = {'model_name': 'newsarticle'}
+BACKFILL_CHUNK = 2000
+
+
+def ensure_news_table(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS news_table (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                text TEXT,
+                label TEXT,
+                article_url TEXT UNIQUE
+            )
+        """)
+        columns = {
+            column.name
+            for column in connection.introspection.get_table_description(cursor, 'news_table')
+        }
+        if 'source_host' not in columns:
+            cursor.execute("ALTER TABLE news_table ADD COLUMN source_host varchar(200) NOT NULL DEFAULT ''")
+        if 'inserted_at' not in columns:
+            cursor.execute("ALTER TABLE news_table ADD COLUMN inserted_at datetime NULL")
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS news_label_idx ON news_table (label)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS news_source_host_idx ON news_table (source_host)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS news_inserted_idx ON news_table (inserted_at)")
+
+    NewsArticle = apps.get_model('detector', 'NewsArticle')
+    pending = NewsArticle.objects.using(connection.alias).filter(source_host='').exclude(article_url=None)
+    batch = []
+    for article in pending.only('id', 'article_url').iterator(chunk_size=BACKFILL_CHUNK):
+        article.source_host = urlparse(article.article_url).netloc.replace('www.', '')
+        batch.append(article)
+        if len(batch) >= BACKFILL_CHUNK:
+            NewsArticle.objects.using(connection.alias).bulk_update(batch, ['source_host'])
+            batch = []
+    if batch:
+        NewsArticle.objects.using(connection.alias).bulk_update(batch, ['source_host'])
+
+
+def drop_news_indexes(apps, schema_editor):
+    # The table and its rows belong to the scraper, so only the indexes go.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP INDEX IF EXISTS news_label_idx")
+        cursor.execute("DROP INDEX IF EXISTS news_source_host_idx")
+        cursor.execute("DROP INDEX IF EXISTS news_inserted_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detector', '0003_review_created_index'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='NewsArticle',
+                    fields=[
+                        ('id', models.AutoField(primary_key=True, serialize=False)),
+                        ('text', models.TextField(null=True)),
+                        ('label', models.CharField(max_length=10, null=True)),
+                        ('article_url', models.TextField(null=True, unique=True)),
+                        ('source_host', models.CharField(blank=True, default='', max_length=200)),
+                        ('inserted_at', models.DateTimeField(default=django.utils.timezone.now, null=True)),
+                    ],
+                    options={
+                        'db_table': 'news_table',
+                        'indexes': [
+                            models.Index(fields=['label'], name='news_label_idx'),
+                            models.Index(fields=['source_host'], name='news_source_host_idx'),
+                            models.Index(fields=['inserted_at'], name='news_inserted_idx'),
+                        ],
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(ensure_news_table, drop_news_indexes, hints=NEWS_HINTS),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-19 01:57
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detector', '0004_newsarticle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Source',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500, unique=True)),
+                ('label', models.CharField(max_length=10)),
+                ('enabled', models.BooleanField(default=True)),
+                ('interval', models.PositiveIntegerField(default=3600)),
+                ('next_due_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_attempt_at', models.DateTimeField(blank=True, null=True)),
+                ('last_success_at', models.DateTimeField(blank=True, null=True)),
+                ('last_new_article_at', models.DateTimeField(blank=True, null=True)),
+                ('etag', models.CharField(blank=True, default='', max_length=200)),
+                ('last_modified', models.CharField(blank=True, default='', max_length=100)),
+                ('consecutive_failures', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('last_yield', models.PositiveIntegerField(default=0)),
+                ('total_yield', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'sources',
+                'indexes': [models.Index(fields=['enabled', 'next_due_at'], name='source_due_idx')],
+            },
+        ),
+    ]
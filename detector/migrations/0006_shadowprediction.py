@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-19 02:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detector', '0005_source'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShadowPrediction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_hash', models.CharField(max_length=64)),
+                ('primary_version', models.CharField(max_length=40)),
+                ('candidate_version', models.CharField(max_length=40)),
+                ('primary_label', models.CharField(max_length=10)),
+                ('candidate_label', models.CharField(max_length=10)),
+                ('agreed', models.BooleanField()),
+                ('primary_confidence', models.FloatField()),
+                ('candidate_confidence', models.FloatField()),
+                ('confidence_delta', models.FloatField()),
+                ('candidate_latency_ms', models.FloatField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['candidate_version', 'created_at'], name='shadow_candidate_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-19 02:38
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detector', '0006_shadowprediction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShadowSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField()),
+                ('primary_label', models.CharField(max_length=10)),
+                ('primary_confidence', models.FloatField()),
+                ('primary_version', models.CharField(max_length=40)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
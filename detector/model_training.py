@@ -1,19 +1,18 @@
-import pandas as pd
 import string
 import os
 import pickle
-import sqlite3
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.svm import SVC
-from sklearn.metrics.pairwise import cosine_similarity
+import hashlib
 
+# pandas and scikit-learn are imported inside the functions that need them,
+# so loading the URLconf (and every management command) stays ML-free.
 from .constant_fakes import IMPOSSIBLE_STATEMENTS
 
 # PATHS
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_FILE = os.path.join(PROJECT_ROOT, "ml_artifacts", "news.db")
 MODEL_FILE = os.path.join(PROJECT_ROOT, "ml_artifacts", "model_state.pkl")
+# float32 export of MODEL_FILE (manage.py export_inference), served when present
+INFERENCE_MODEL_FILE = os.path.join(PROJECT_ROOT, "ml_artifacts", "model_state.inference.pkl")
 
 # PREPROCESS
 def preprocess_text(text):
@@ -21,57 +20,249 @@ def preprocess_text(text):
     text = text.translate(str.maketrans("", "", string.punctuation))
     return text
 
-# LOAD DATA
-def load_dataset():
-    if not os.path.exists(DB_FILE):
-        return pd.DataFrame(columns=["text", "label", "article_url"])
+def preprocess_texts(texts):
+    return [preprocess_text(text) for text in texts]
 
-    conn = sqlite3.connect(DB_FILE)
+# LOAD DATA
+DATASET_COLUMNS = ["text", "label", "article_url"]
+
+def load_dataset(snapshot=None):
+    """
+    news_table as a DataFrame of DATASET_COLUMNS plus cleaned_text. With
+    ``snapshot`` ("latest", a version or a path), read it from a Parquet/Arrow
+    snapshot (manage.py export_snapshot) instead of the database.
+    """
+    import pandas as pd
+    from django.db import DatabaseError
+    from .news_corpus import iter_article_chunks
+
+    if snapshot:
+        from .snapshots import load_snapshot
+        return load_snapshot(snapshot, columns=DATASET_COLUMNS + ["cleaned_text"])
+
+    frames = []
     try:
-        df = pd.read_sql_query("SELECT text, label, article_url FROM news_table", conn)
-    except:
-        df = pd.DataFrame(columns=["text", "label", "article_url"])
-    finally:
-        conn.close()
-
-    if df.empty:
-        return df
+        for chunk in iter_article_chunks(DATASET_COLUMNS):
+            frame = pd.DataFrame(chunk, columns=DATASET_COLUMNS)
+            frame["cleaned_text"] = frame["text"].apply(preprocess_text)
+            frames.append(frame)
+    except DatabaseError:
+        frames = []
+
+    if not frames:
+        return pd.DataFrame(columns=DATASET_COLUMNS)
+
+    return pd.concat(frames, ignore_index=True)
+
+# FEATURES
+# Feature-reduction stage for the TF-IDF vectorizer. `python scripts/evaluate.py
+# --features` reports accuracy, artifact size and latency per operating point;
+# min_df=2 drops the singleton n-grams (~83% of the vocabulary) and scored
+# better than the full vocabulary on all three.
+FEATURE_CONFIG = {
+    "min_df": 2,          # drop n-grams seen in fewer documents (int) or fraction (float)
+    "max_df": 1.0,        # drop n-grams seen in more than this fraction of documents
+    "max_features": None, # keep only the most frequent n-grams
+    "selector": None,     # None, "chi2" (SelectKBest) or "l1" (L1-penalized LinearSVC)
+    "k": 5000,            # features kept by the selector
+    "hashing": False,     # HashingVectorizer instead of a stored vocabulary
+    "hash_bits": 18,      # 2**hash_bits hashed features
+}
+
+def build_vectorizer(config=None):
+    """
+    Return an unfitted text -> feature transformer for ``config`` (merged over
+    FEATURE_CONFIG): a plain TfidfVectorizer, or a Pipeline when hashing or
+    a selector is configured. Selectors need labels, so fit with (X, y).
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+    from sklearn.feature_selection import SelectFromModel, SelectKBest, chi2
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import Normalizer
+    from sklearn.svm import LinearSVC
+
+    config = {**FEATURE_CONFIG, **(config or {})}
+
+    if config["hashing"]:
+        steps = [
+            ("hash", HashingVectorizer(stop_words="english", ngram_range=(1, 2),
+                                       n_features=2 ** config["hash_bits"],
+                                       alternate_sign=False, norm=None)),
+            ("tfidf", TfidfTransformer()),
+        ]
+    else:
+        steps = [
+            ("tfidf", TfidfVectorizer(stop_words="english", ngram_range=(1, 2),
+                                      min_df=config["min_df"], max_df=config["max_df"],
+                                      max_features=config["max_features"])),
+        ]
+
+    if config["selector"] == "chi2":
+        steps.append(("select", SelectKBest(chi2, k=config["k"])))
+    elif config["selector"] == "l1":
+        steps.append(("select", SelectFromModel(
+            LinearSVC(penalty="l1", dual=False, C=1.0, class_weight="balanced"),
+            max_features=config["k"], threshold=-float("inf"),
+        )))
+    elif config["selector"] is not None:
+        raise ValueError(f"Unknown feature selector: {config['selector']!r}")
+
+    if config["selector"] is not None:
+        # Selection breaks the unit-length rows TF-IDF produces.
+        steps.append(("norm", Normalizer()))
+
+    if len(steps) == 1:
+        return steps[0][1]
+    return Pipeline(steps)
+
+def n_features(vectorizer):
+    return vectorizer.transform([""]).shape[1]
+
+# CLASSIFIER
+SVC_PARAMS = {
+    "C": 1.0,
+    "gamma": "scale",
+    "class_weight": {"fake": 3, "real": 1},
+}
+
+def build_classifier(params=None, probability=True):
+    from sklearn.svm import SVC
+
+    return SVC(probability=probability, **{**SVC_PARAMS, **(params or {})})
+
+def build_artifact(vectorizer, model, X, labels, urls):
+    """
+    Bundle a fitted vectorizer and classifier with the compact corpus and the
+    explanation table, ready for save_artifact.
+    """
+    from .corpus_store import CompactCorpus
+    from .explain import Explainer
+    from .inference_export import resolve_gamma
 
-    df["cleaned_text"] = df["text"].apply(preprocess_text)
-    return df
+    return {
+        "corpus": CompactCorpus.build(urls, labels, X),
+        "vectorizer": vectorizer,
+        "model": model,
+        "explainer": Explainer.fit(vectorizer, X, model.predict(X)),
+        # gamma="scale" depends on X, which export_inference no longer has
+        "svc_gamma": resolve_gamma(model, X),
+    }
 
-# TRAIN MODEL
-def train_model():
+# TRAIN MODEL (manage.py train_detector is the parallel, instrumented version)
+def train_model(feature_config=None, svc_params=None):
     df = load_dataset()
     if df.empty:
         return None, None, None
 
-    vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2))
-    X = vectorizer.fit_transform(df["cleaned_text"])
     y = df["label"]
+    vectorizer = build_vectorizer(feature_config)
+    X = vectorizer.fit_transform(df["cleaned_text"], y)
 
-    model = SVC(probability=True, class_weight={"fake": 3, "real": 1})
+    model = build_classifier(svc_params)
     model.fit(X, y)
 
-    with open(MODEL_FILE, "wb") as f:
-        pickle.dump((df, vectorizer, model), f)
+    artifact = build_artifact(vectorizer, model, X, y.tolist(), df["article_url"].tolist())
+    save_artifact(artifact, MODEL_FILE)
 
-    return df, vectorizer, model
+    return artifact["corpus"], vectorizer, model
+
+# SAVE / LOAD ARTIFACTS
+def save_artifact(artifact, path):
+    """
+    Pickle to a temp file in the same directory, then rename over ``path``,
+    so a worker loading the artifact never sees a half-written file.
+    """
+    import tempfile
+
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".pkl")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates files readable by the owner only
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_artifact(path):
+    """
+    Return the artifact at ``path`` as a dict with corpus, vectorizer and model.
+    """
+    from .corpus_store import CompactCorpus
+    from .explain import Explainer
+
+    with open(path, "rb") as f:
+        artifact = pickle.load(f)
+
+    # Older artifacts are a (DataFrame, vectorizer, model) tuple.
+    if isinstance(artifact, tuple):
+        df, vectorizer, model = artifact
+        corpus = CompactCorpus.from_dataframe(df, vectorizer) if df is not None else None
+        artifact = {"corpus": corpus, "vectorizer": vectorizer, "model": model}
+
+    # Artifacts from before explanations: the corpus rows are the training
+    # matrix. Re-predicting it with the SVC would add seconds to every worker
+    # boot, so the surrogate mimics the training labels until the next retrain.
+    if "explainer" not in artifact:
+        corpus = artifact["corpus"]
+        artifact["explainer"] = (
+            Explainer.fit(artifact["vectorizer"], corpus.vectors,
+                          [corpus.label_names[code] for code in corpus.label_codes])
+            if corpus is not None and len(corpus) else None
+        )
+
+    return artifact
 
 # LOAD MODEL
-_df, _vectorizer, _model = None, None, None
+_corpus, _vectorizer, _model = None, None, None
+_explainer = None
+_model_version = None
 
-def get_model():
-    global _df, _vectorizer, _model
+def file_digest(path):
+    if not os.path.exists(path):
+        return "untrained"
 
-    if _df is None:
-        if not os.path.exists(MODEL_FILE):
-            _df, _vectorizer, _model = train_model()
-        else:
-            with open(MODEL_FILE, "rb") as f:
-                _df, _vectorizer, _model = pickle.load(f)
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
 
-    return _df, _vectorizer, _model
+def get_model():
+    global _corpus, _vectorizer, _model, _explainer, _model_version
+
+    if _corpus is None:
+        if not os.path.exists(MODEL_FILE) and train_model()[0] is None:
+            # Prediction.model_version is NOT NULL; history still records these.
+            _model_version = file_digest(MODEL_FILE)
+            return None, None, None
+        artifact, path = _serving_artifact()
+        _corpus, _vectorizer, _model = artifact["corpus"], artifact["vectorizer"], artifact["model"]
+        _explainer = artifact.get("explainer")
+        _model_version = file_digest(path)
+
+    return _corpus, _vectorizer, _model
+
+def get_explainer():
+    get_model()
+    return _explainer
+
+def _serving_artifact():
+    # The float32 export is only used while it matches the current MODEL_FILE.
+    if os.path.exists(INFERENCE_MODEL_FILE):
+        artifact = load_artifact(INFERENCE_MODEL_FILE)
+        if artifact.get("source_version") == file_digest(MODEL_FILE):
+            return artifact, INFERENCE_MODEL_FILE
+
+    return load_artifact(MODEL_FILE), MODEL_FILE
+
+# MODEL VERSION (content hash of the loaded artifact)
+def get_model_version():
+    get_model()
+    return _model_version
 
 #  FLEXIBLE IMPOSSIBLE CHECK
 def is_impossible(text):
@@ -92,19 +283,17 @@ def is_impossible(text):
     return False, ""
 
 # FIND CLOSEST
-def find_closest(cleaned, df, vectorizer):
-    if df is None or df.empty:
+def find_closest(cleaned, corpus, vectorizer, input_vec=None):
+    if corpus is None or len(corpus) == 0:
         return None
 
-    vectors = vectorizer.transform(df["cleaned_text"])
-    input_vec = vectorizer.transform([cleaned])
-    sim = cosine_similarity(input_vec, vectors)[0]
-    idx = sim.argmax()
-    return df.iloc[idx]
+    if input_vec is None:
+        input_vec = vectorizer.transform([cleaned])
+    return corpus.row(corpus.closest(input_vec))
 
 #  FINAL PREDICT
 def predict_news(text):
-    df, vectorizer, model = get_model()
+    corpus, vectorizer, model = get_model()
 
     # RULE-BASED
     impossible, reason = is_impossible(text)
@@ -118,7 +307,7 @@ def predict_news(text):
     }
 
     # MODEL CHECK
-    if model is None or vectorizer is None or df is None or df.empty:
+    if model is None or vectorizer is None or corpus is None or len(corpus) == 0:
         return {
             "label": "FAKE",
             "confidence": 50,
@@ -135,17 +324,21 @@ def predict_news(text):
     prob = model.predict_proba(input_vec)[0]
     confidence = round(max(prob) * 100, 2)
 
-    closest = find_closest(cleaned, df, vectorizer)
+    closest = find_closest(cleaned, corpus, vectorizer, input_vec)
 
     if closest is not None:
         url = closest.get("article_url", "")
     else:
         url = ""
 
+    label = str(pred).upper()
+    explainer = get_explainer()
+    reason = explainer.reason(input_vec, label) if explainer is not None else ""
+
     return {
-        "label": str(pred).upper(),
+        "label": label,
         "confidence": confidence,
-        "reason": "",
+        "reason": reason,
         "source": "",
         "article_url": url
     }
@@ -1,9 +1,144 @@
 from django.db import models
+from django.utils import timezone
 
 class Review(models.Model):
     name = models.CharField(max_length=100, default="Anonymous")
     review = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Backs the keyset pagination in the review API.
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="review_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.name}: {self.review[:20]}"
+
+
+class Prediction(models.Model):
+    text_hash = models.CharField(max_length=64)
+    normalized_text = models.TextField()
+    label = models.CharField(max_length=10)
+    confidence = models.FloatField()
+    reason = models.TextField(blank=True, default="")
+    source = models.CharField(max_length=200, blank=True, default="")
+    article_url = models.TextField(blank=True, default="")
+    model_version = models.CharField(max_length=40)
+    latency_ms = models.FloatField()
+    # Set when the prediction is made, not when the write-behind buffer flushes.
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["text_hash", "-created_at"], name="prediction_hash_idx"),
+            models.Index(fields=["created_at"], name="prediction_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.label} ({self.confidence}%): {self.normalized_text[:20]}"
+
+
+class ShadowSample(models.Model):
+    """
+    A live request picked for shadow evaluation, waiting for the
+    shadow_score command; deleted once it has been scored.
+    """
+
+    text = models.TextField()
+    primary_label = models.CharField(max_length=10)
+    primary_confidence = models.FloatField()
+    primary_version = models.CharField(max_length=40)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.primary_label}: {self.text[:20]}"
+
+
+class ShadowPrediction(models.Model):
+    """
+    A sampled live request scored again by the candidate model (see
+    detector/shadow.py), next to what the serving model answered.
+    """
+
+    text_hash = models.CharField(max_length=64)
+    primary_version = models.CharField(max_length=40)
+    candidate_version = models.CharField(max_length=40)
+    primary_label = models.CharField(max_length=10)
+    candidate_label = models.CharField(max_length=10)
+    agreed = models.BooleanField()
+    primary_confidence = models.FloatField()
+    candidate_confidence = models.FloatField()
+    # candidate_confidence - primary_confidence, in percentage points
+    confidence_delta = models.FloatField()
+    candidate_latency_ms = models.FloatField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["candidate_version", "created_at"], name="shadow_candidate_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.primary_label} -> {self.candidate_label}: {self.text_hash[:12]}"
+
+
+class NewsArticle(models.Model):
+    """
+    Scraped headline corpus. Lives in the news_db database (see NewsRouter)
+    on the news_table created by the scraper scripts.
+    """
+
+    id = models.AutoField(primary_key=True)
+    text = models.TextField(null=True)
+    label = models.CharField(max_length=10, null=True)
+    article_url = models.TextField(unique=True, null=True)
+    source_host = models.CharField(max_length=200, blank=True, default="")
+    # NULL for rows scraped before insert times were recorded.
+    inserted_at = models.DateTimeField(null=True, default=timezone.now)
+
+    class Meta:
+        db_table = "news_table"
+        indexes = [
+            models.Index(fields=["label"], name="news_label_idx"),
+            models.Index(fields=["source_host"], name="news_source_host_idx"),
+            models.Index(fields=["inserted_at"], name="news_inserted_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.label}: {(self.text or '')[:20]}"
+
+
+class Source(models.Model):
+    """
+    A listing page polled by the scrape_sources command. Lives in news_db
+    next to news_table. ``interval`` (seconds) adapts to how many new
+    articles each fetch yields; failures push ``next_due_at`` out with
+    exponential backoff instead.
+    """
+
+    url = models.URLField(max_length=500, unique=True)
+    label = models.CharField(max_length=10)
+    enabled = models.BooleanField(default=True)
+    interval = models.PositiveIntegerField(default=3600)
+    next_due_at = models.DateTimeField(default=timezone.now)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+    # Watermarks: the last fetch that succeeded, the last one that found
+    # anything new, and the HTTP validators for conditional requests.
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    last_new_article_at = models.DateTimeField(null=True, blank=True)
+    etag = models.CharField(max_length=200, blank=True, default="")
+    last_modified = models.CharField(max_length=100, blank=True, default="")
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    last_yield = models.PositiveIntegerField(default=0)
+    total_yield = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "sources"
+        indexes = [
+            models.Index(fields=["enabled", "next_due_at"], name="source_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.label}: {self.url}"
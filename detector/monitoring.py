@@ -0,0 +1,182 @@
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+from .model_training import get_model, get_model_version, preprocess_text
+
+_config = getattr(settings, "MONITORING", {})
+WINDOW_SECONDS = _config.get("WINDOW_SECONDS", 300)
+WINDOWS = _config.get("WINDOWS", 12)
+
+CONFIDENCE_BINS = 10  # 0-10%, 10-20%, ... 90-100%
+OOV_BINS = 10         # per-request out-of-vocabulary fraction, same bucketing
+
+
+def _bucket(fraction, bins):
+    return min(max(int(fraction * bins), 0), bins - 1)
+
+
+class Window:
+    """
+    Fixed-size counters for one time window: a few integers, two small
+    histograms and a label dict bounded by the model's classes.
+    """
+
+    __slots__ = ("start", "requests", "tokens", "oov_tokens", "rule_hits", "labels", "confidence", "oov")
+
+    def __init__(self, start):
+        self.start = start
+        self.requests = 0
+        self.tokens = 0
+        self.oov_tokens = 0
+        self.rule_hits = 0
+        self.labels = {}
+        self.confidence = [0] * CONFIDENCE_BINS
+        self.oov = [0] * OOV_BINS
+
+    def merge(self, other):
+        self.requests += other.requests
+        self.tokens += other.tokens
+        self.oov_tokens += other.oov_tokens
+        self.rule_hits += other.rule_hits
+        for label, count in other.labels.items():
+            self.labels[label] = self.labels.get(label, 0) + count
+        self.confidence = [a + b for a, b in zip(self.confidence, other.confidence)]
+        self.oov = [a + b for a, b in zip(self.oov, other.oov)]
+
+    def as_dict(self):
+        model_requests = self.requests - self.rule_hits
+        return {
+            "start": self.start,
+            "requests": self.requests,
+            "oov_rate": self.oov_tokens / self.tokens if self.tokens else None,
+            "rule_hit_rate": self.rule_hits / self.requests if self.requests else None,
+            "label_mix": {label: count / self.requests for label, count in sorted(self.labels.items())}
+                         if self.requests else {},
+            # Rule-engine answers have a fixed confidence, so only model answers are bucketed.
+            "confidence_histogram": self.confidence,
+            "oov_histogram": self.oov,
+            "model_requests": model_requests,
+        }
+
+
+class DriftMonitor:
+    """
+    Ring of the last ``windows`` windows of ``window_seconds`` each. Older
+    windows fall off the deque, so memory is constant however long the
+    process runs. Counts are per process (per gunicorn worker).
+    """
+
+    def __init__(self, window_seconds=WINDOW_SECONDS, windows=WINDOWS):
+        self.window_seconds = window_seconds
+        self._windows = deque(maxlen=windows)
+        self._lock = threading.Lock()
+
+    def _current(self, now):
+        start = int(now - now % self.window_seconds)
+        if not self._windows or self._windows[-1].start != start:
+            self._windows.append(Window(start))
+        return self._windows[-1]
+
+    def observe(self, label, confidence, rule_hit, tokens=0, oov_tokens=0, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            window = self._current(now)
+            window.requests += 1
+            window.labels[label] = window.labels.get(label, 0) + 1
+            if rule_hit:
+                window.rule_hits += 1
+            else:
+                window.confidence[_bucket(confidence / 100, CONFIDENCE_BINS)] += 1
+            if tokens:
+                window.tokens += tokens
+                window.oov_tokens += oov_tokens
+                window.oov[_bucket(oov_tokens / tokens, OOV_BINS)] += 1
+
+    def snapshot(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            # Drop windows that aged out while no requests arrived.
+            oldest = now - self.window_seconds * self._windows.maxlen
+            windows = [window for window in self._windows if window.start >= oldest]
+            total = Window(windows[0].start if windows else int(now))
+            for window in windows:
+                total.merge(window)
+            return {
+                "windows": [window.as_dict() for window in windows],
+                "total": total.as_dict(),
+            }
+
+
+monitor = DriftMonitor()
+
+# Unigram tokenizer and vocabulary of the serving vectorizer, keyed by model version
+_vocabulary = (None, None, None, None)
+_vocabulary_lock = threading.Lock()
+
+
+def _vocabulary_for_model():
+    global _vocabulary
+
+    version = get_model_version()
+    if _vocabulary[0] == version:
+        return _vocabulary[1:]
+
+    with _vocabulary_lock:
+        if _vocabulary[0] != version:
+            _, vectorizer, _ = get_model()
+            # A feature Pipeline starts with the text vectorizer.
+            if hasattr(vectorizer, "steps"):
+                vectorizer = vectorizer.steps[0][1]
+            vocabulary = getattr(vectorizer, "vocabulary_", None)
+            if vocabulary is None:
+                # Hashed features have no vocabulary to be out of.
+                _vocabulary = (version, None, None, None)
+            else:
+                _vocabulary = (version, vectorizer.build_tokenizer(),
+                               frozenset(vectorizer.get_stop_words() or ()), vocabulary)
+    return _vocabulary[1:]
+
+
+def oov_counts(text):
+    """
+    (tokens, out-of-vocabulary tokens) for ``text`` against the serving
+    vectorizer's fitted vocabulary, ignoring stop words the vectorizer
+    drops anyway. (0, 0) when the model has no vocabulary.
+    """
+    tokenizer, stop_words, vocabulary = _vocabulary_for_model()
+    if vocabulary is None:
+        return 0, 0
+
+    tokens = [token for token in tokenizer(preprocess_text(text)) if token not in stop_words]
+    return len(tokens), sum(1 for token in tokens if token not in vocabulary)
+
+
+# OBSERVE
+def observe(text, result):
+    """
+    Record one served prediction. Cost is one tokenization of the input
+    plus a few counter updates under a lock.
+    """
+    rule_hit = result.get("source") == "Rule-based"
+    tokens, oov_tokens = (0, 0) if rule_hit else oov_counts(text)
+    monitor.observe(
+        label=result.get("label", ""),
+        confidence=float(result.get("confidence", 0)),
+        rule_hit=rule_hit,
+        tokens=tokens,
+        oov_tokens=oov_tokens,
+    )
+
+
+def stats():
+    return {
+        "pid": os.getpid(),
+        # Version whose vocabulary the OOV counts used; read without loading the model.
+        "model_version": _vocabulary[0],
+        "window_seconds": monitor.window_seconds,
+        **monitor.snapshot(),
+    }
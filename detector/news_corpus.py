@@ -0,0 +1,30 @@
+from .models import NewsArticle
+
+CHUNK_SIZE = 2000
+DEFAULT_FIELDS = ("text", "label", "article_url")
+
+
+# STREAMING LOADERS
+def iter_articles(fields=DEFAULT_FIELDS, chunk_size=CHUNK_SIZE, **filters):
+    """
+    Yield news_table rows as tuples of ``fields`` in id order, fetching
+    ``chunk_size`` rows at a time instead of materializing the corpus.
+    Keyword arguments are passed to ``filter()``, e.g. ``label="fake"``.
+    """
+    queryset = NewsArticle.objects.filter(**filters).order_by("id").values_list(*fields)
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def iter_article_chunks(fields=DEFAULT_FIELDS, chunk_size=CHUNK_SIZE, **filters):
+    """
+    Like iter_articles, but yields lists of up to ``chunk_size`` rows so
+    callers can process (or hand to a worker pool) one chunk at a time.
+    """
+    chunk = []
+    for row in iter_articles(fields, chunk_size, **filters):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
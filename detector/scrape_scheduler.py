@@ -0,0 +1,171 @@
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+
+from .models import NewsArticle, Source
+from .scraping import FAKE_SOURCES, REAL_SOURCES, fetch_headlines, source_host
+
+logger = logging.getLogger(__name__)
+
+# Stays under SQLite's bound-parameter limit in article_url__in lookups
+URL_LOOKUP_CHUNK = 500
+
+_config = getattr(settings, "SCRAPE_SCHEDULE", {})
+MIN_INTERVAL = _config.get("MIN_INTERVAL", 600)
+MAX_INTERVAL = _config.get("MAX_INTERVAL", 86400)
+TARGET_YIELD = _config.get("TARGET_YIELD", 5)
+MAX_STEP = _config.get("MAX_STEP", 2.0)
+RETRY_BASE = _config.get("RETRY_BASE", 300)
+JITTER = _config.get("JITTER", 0.1)
+WORKERS = _config.get("WORKERS", 8)
+
+
+# SOURCES
+def seed_sources():
+    """
+    Add the built-in source lists to the sources table. Existing rows keep
+    their schedule. Returns the number of sources added.
+    """
+    added = 0
+    for urls, label in ((REAL_SOURCES, "real"), (FAKE_SOURCES, "fake")):
+        for url in urls:
+            _, created = Source.objects.get_or_create(url=url, defaults={"label": label})
+            added += created
+    return added
+
+
+def due_sources(now=None, limit=None):
+    now = now or timezone.now()
+    queryset = Source.objects.filter(enabled=True, next_due_at__lte=now).order_by("next_due_at")
+    return list(queryset[:limit] if limit else queryset)
+
+
+def next_wakeup():
+    """
+    When the earliest enabled source falls due, or None if there are none.
+    """
+    source = Source.objects.filter(enabled=True).order_by("next_due_at").only("next_due_at").first()
+    return source.next_due_at if source else None
+
+
+# SCHEDULING
+def _jittered(seconds):
+    return seconds * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+def adapt_interval(interval, new_count):
+    """
+    Scale the polling interval towards TARGET_YIELD new articles per fetch:
+    a source that yielded twice the target is polled twice as often, one
+    that yielded nothing half as often. Each step is capped at MAX_STEP.
+    """
+    factor = TARGET_YIELD / max(new_count, TARGET_YIELD / MAX_STEP)
+    factor = min(max(factor, 1 / MAX_STEP), MAX_STEP)
+    return int(min(max(interval * factor, MIN_INTERVAL), MAX_INTERVAL))
+
+
+def record_success(source, new_count, etag, last_modified, now):
+    # The first fetch finds the whole page new, which says nothing about
+    # how often the source publishes, so it does not move the interval.
+    if source.last_success_at is not None:
+        source.interval = adapt_interval(source.interval, new_count)
+    source.last_success_at = now
+    if new_count:
+        source.last_new_article_at = now
+    source.etag = etag
+    source.last_modified = last_modified
+    source.consecutive_failures = 0
+    source.last_error = ""
+    source.last_yield = new_count
+    source.total_yield += new_count
+    source.next_due_at = now + timedelta(seconds=_jittered(source.interval))
+
+
+def record_failure(source, error, now):
+    """
+    Retry after RETRY_BASE seconds, doubling per consecutive failure up to
+    MAX_INTERVAL. The adaptive interval is left as it was.
+    """
+    source.consecutive_failures += 1
+    source.last_error = str(error)[:1000]
+    delay = min(RETRY_BASE * 2 ** (source.consecutive_failures - 1), MAX_INTERVAL)
+    source.next_due_at = now + timedelta(seconds=_jittered(delay))
+
+
+# STORAGE
+def store_articles(articles, now):
+    """
+    Insert articles not yet in news_table and return how many were new.
+    """
+    urls = [article["article_url"] for article in articles]
+    known = set()
+    for start in range(0, len(urls), URL_LOOKUP_CHUNK):
+        known.update(
+            NewsArticle.objects.filter(article_url__in=urls[start:start + URL_LOOKUP_CHUNK])
+            .values_list("article_url", flat=True)
+        )
+
+    new = [
+        NewsArticle(text=article["text"], label=article["label"], article_url=article["article_url"],
+                    source_host=source_host(article["article_url"]), inserted_at=now)
+        for article in articles if article["article_url"] not in known
+    ]
+    NewsArticle.objects.bulk_create(new, batch_size=URL_LOOKUP_CHUNK, ignore_conflicts=True)
+    return len(new)
+
+
+# CYCLE
+def _fetch(source):
+    try:
+        return fetch_headlines(source.url, source.label, source.etag, source.last_modified), None
+    except requests.exceptions.RequestException as e:
+        return None, e
+    except Exception as e:
+        # A page the parser chokes on fails this source, not the cycle.
+        logger.exception("Parsing %s failed", source.url)
+        return None, e
+
+
+def run_cycle(workers=WORKERS, limit=None, now=None):
+    """
+    Fetch every source that is due, store what is new and reschedule each
+    source. Pages are fetched in a thread pool; all database work stays on
+    the calling thread. An error in one source is recorded as a failure
+    of that source and the cycle moves on. Returns a list of
+    (source, new_count, error).
+    """
+    now = now or timezone.now()
+    sources = due_sources(now, limit)
+    if not sources:
+        return []
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sources)))) as pool:
+        for source, (fetched, error) in zip(sources, pool.map(_fetch, sources)):
+            finished = timezone.now()
+            source.last_attempt_at = finished
+            new_count = 0
+            if error is None:
+                articles, etag, last_modified = fetched
+                try:
+                    if articles:
+                        new_count = store_articles(articles, finished)
+                except Exception as e:
+                    logger.exception("Storing articles from %s failed", source.url)
+                    error = e
+            if error is not None:
+                record_failure(source, error, finished)
+            else:
+                record_success(source, new_count, etag, last_modified, finished)
+            try:
+                source.save()
+            except Exception:
+                # Unsaved, the source keeps its old schedule and is retried next cycle.
+                logger.exception("Could not reschedule %s", source.url)
+            results.append((source, new_count, error))
+    return results
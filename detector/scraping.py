@@ -0,0 +1,131 @@
+import html
+import re
+import time
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+# ---------------- SOURCES ----------------
+# Seed lists for the sources table (see the scrape_sources command) and the
+# one-shot scraper script.
+REAL_SOURCES = [
+    "https://www.hindustantimes.com/",
+    "https://www.indiatoday.in/",
+    "https://www.ndtv.com/latest",
+    "https://www.dnaindia.com/",
+    "https://www.bhaskar.com/",
+    "https://timesofindia.indiatimes.com/",
+    "https://www.reuters.com/world/",
+    "https://www.bbc.com/news",
+]
+
+FAKE_SOURCES = [
+    "https://www.altnews.in/fake-news/",
+    "https://www.boomlive.in/fact-check/",
+    "https://www.factchecker.in/",
+    "https://www.thequint.com/webqoof",
+    "https://www.indiatoday.in/fact-check",
+    "https://factcheck.pib.gov.in/",
+    "https://www.vishvasnews.com/english/",
+    "https://newschecker.in/",
+    "https://www.factcrescendo.com/",
+    "https://www.politifact.com/factchecks/",
+    "https://fullfact.org/",
+    "https://www.snopes.com/fact-check/",
+    "https://factcheck.afp.com/",
+    "https://www.reuters.com/fact-check/",
+]
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Connection": "keep-alive",
+}
+REQUEST_TIMEOUT = 8
+
+
+# ---------------- TEXT CLEANING ----------------
+def clean_text(text):
+    text = html.unescape(text)
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    text = text.lower()
+    return text
+
+
+def source_host(url):
+    return urlparse(url).netloc.replace("www.", "")
+
+
+# ---------------- HEADLINE QUALITY FILTER ----------------
+SKIP_PHRASES = {
+    "subscribe", "read more", "click here", "sign in", "log in",
+    "home", "about us", "contact us", "privacy policy", "terms of use",
+    "terms and conditions", "correction policy", "grievance redressal"
+}
+
+
+def is_valid_headline(title):
+    if len(title) < 25:
+        return False
+    if title.lower() in SKIP_PHRASES:
+        return False
+    return True
+
+
+# ---------------- SCRAPER ----------------
+def parse_headlines(content, base_url, label):
+    """
+    Headline links on a listing page, de-duplicated by article URL.
+    """
+    articles = {}
+    soup = BeautifulSoup(content, "html.parser")
+    for link in soup.find_all("a", href=True):
+        title = clean_text(link.get_text())
+        if not is_valid_headline(title):
+            continue
+        href = link["href"]
+        full_url = href if href.startswith("http") else urljoin(base_url, href)
+        articles.setdefault(full_url, {"text": title, "label": label, "article_url": full_url})
+    return list(articles.values())
+
+
+def fetch_headlines(url, label, etag="", last_modified="", timeout=REQUEST_TIMEOUT):
+    """
+    Fetch one listing page. ``etag`` and ``last_modified`` are the validators
+    from the previous successful fetch; when the server answers 304 Not
+    Modified, ``articles`` is None and nothing is parsed.
+
+    Returns (articles, etag, last_modified). Raises requests.RequestException.
+    """
+    headers = dict(HEADERS)
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    resp = requests.get(url, headers=headers, timeout=timeout)
+    if resp.status_code == 304:
+        return None, etag, last_modified
+    resp.raise_for_status()
+
+    return (
+        parse_headlines(resp.content, url, label),
+        resp.headers.get("ETag", ""),
+        resp.headers.get("Last-Modified", ""),
+    )
+
+
+def scrape_url(url, label, retries=3, delay=2):
+    for attempt in range(retries):
+        try:
+            articles, _, _ = fetch_headlines(url, label)
+            return articles
+        except requests.exceptions.RequestException as e:
+            print(f"[WARN] Attempt {attempt+1} failed for {url} -> {e}")
+            time.sleep(delay)
+    print(f"[ERROR] Skipping URL due to repeated failures: {url}")
+    return []
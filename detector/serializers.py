@@ -5,3 +5,7 @@ class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = ['id', 'name', 'review', 'created_at']
+        extra_kwargs = {'name': {'allow_blank': True}}
+
+    def validate_name(self, value):
+        return value or "Anonymous"
@@ -0,0 +1,93 @@
+import random
+import threading
+import time
+
+from django.conf import settings
+
+from .history import normalize_text, text_hash
+from .model_training import get_model_version, preprocess_text
+from .models import ShadowPrediction, ShadowSample
+from .write_behind import WriteBehindBuffer
+
+# Serving workers only pick and store samples; the candidate model is loaded
+# and run by one separate process (manage.py shadow_score), so it costs the
+# workers neither memory nor CPU time.
+_config = getattr(settings, "SHADOW_MODEL", {})
+ARTIFACT = _config.get("ARTIFACT") or ""
+SAMPLE_RATE = _config.get("SAMPLE_RATE", 0.1)
+
+_samples = WriteBehindBuffer.from_settings(ShadowSample, max_pending=_config.get("MAX_PENDING", 1000))
+
+# Requests sampled by the current thread, stored once its response is sent.
+_deferred = threading.local()
+
+
+# SAMPLE (serving workers)
+def sample(text, result):
+    """
+    Pick this prediction for shadow scoring with probability SAMPLE_RATE.
+    Nothing is queued until the response has been sent (release_deferred).
+    Rule-based answers and a missing serving model are skipped, since
+    they say nothing about the candidate.
+    """
+    if not ARTIFACT or random.random() >= SAMPLE_RATE:
+        return
+    if result.get("source") == "Rule-based" or result.get("reason") == "Model not available":
+        return
+
+    items = getattr(_deferred, "items", None)
+    if items is None:
+        items = _deferred.items = []
+    items.append(ShadowSample(
+        text=text,
+        primary_label=result.get("label", ""),
+        primary_confidence=float(result.get("confidence", 0)),
+        primary_version=get_model_version(),
+    ))
+
+
+def release_deferred(sender=None, **kwargs):
+    """
+    request_finished receiver: hand this thread's samples to the write-behind
+    buffer. Samples beyond MAX_PENDING are dropped.
+    """
+    items = getattr(_deferred, "items", None)
+    if not items:
+        return
+    _deferred.items = []
+    for item in items:
+        _samples.put(item)
+
+
+def flush():
+    _samples.flush()
+
+
+# SCORE (manage.py shadow_score)
+def score(artifact, candidate_version, shadow_sample):
+    """
+    ShadowPrediction for one sample. Same ML path as predict_news, minus the
+    closest-article lookup and the explanation, which do not change the
+    label or confidence.
+    """
+    vectorizer, model = artifact["vectorizer"], artifact["model"]
+
+    start = time.perf_counter()
+    input_vec = vectorizer.transform([preprocess_text(shadow_sample.text)])
+    label = str(model.predict(input_vec)[0]).upper()
+    confidence = round(max(model.predict_proba(input_vec)[0]) * 100, 2)
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    return ShadowPrediction(
+        text_hash=text_hash(normalize_text(shadow_sample.text)),
+        primary_version=shadow_sample.primary_version,
+        candidate_version=candidate_version,
+        primary_label=shadow_sample.primary_label,
+        candidate_label=label,
+        agreed=label == shadow_sample.primary_label,
+        primary_confidence=shadow_sample.primary_confidence,
+        candidate_confidence=confidence,
+        confidence_delta=confidence - shadow_sample.primary_confidence,
+        candidate_latency_ms=latency_ms,
+        created_at=shadow_sample.created_at,
+    )
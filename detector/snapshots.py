@@ -0,0 +1,200 @@
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+
+# pyarrow (in requirements.txt) is only imported here, when a snapshot is
+# written or read, so serving workers never load it.
+from .model_training import PROJECT_ROOT, file_digest, preprocess_text, preprocess_texts
+from .news_corpus import iter_article_chunks
+
+SNAPSHOT_DIR = os.path.join(PROJECT_ROOT, "ml_artifacts", "snapshots")
+LATEST_POINTER = "LATEST"
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+SOURCE_COLUMNS = ("id", "text", "label", "article_url", "source_host")
+# What training and evaluation read by default
+TRAINING_COLUMNS = ("cleaned_text", "label", "article_url")
+CHUNK_SIZE = 50000
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:
+        raise ImportError("Snapshots need pyarrow: pip install -r requirements.txt") from exc
+    return pa
+
+
+def preprocess_digest():
+    """
+    Fingerprint of preprocess_text, recorded in each manifest so a snapshot
+    whose cleaned_text was produced by different preprocessing is noticed.
+    """
+    return hashlib.sha1(inspect.getsource(preprocess_text).encode("utf-8")).hexdigest()[:12]
+
+
+def _new_version(directory, created):
+    # Microseconds keep versions sortable; the counter covers clock ties.
+    # No dots, since a version is recovered from a file name by splitext.
+    base = version = created.strftime("news-%Y%m%dT%H%M%S%fZ")
+    counter = 1
+    while any(os.path.exists(os.path.join(directory, version + suffix))
+              for suffix in (".json", *FORMATS.values())):
+        counter += 1
+        version = f"{base}-{counter}"
+    return version
+
+
+def _schema(pa, fmt):
+    # Labels and hosts repeat across millions of rows, so Parquet stores them
+    # dictionary encoded. The Arrow file format cannot change a dictionary
+    # between batches, so there they stay plain strings.
+    category = pa.dictionary(pa.int32(), pa.string()) if fmt == "parquet" else pa.string()
+    return pa.schema([
+        ("id", pa.int64()),
+        ("text", pa.string()),
+        ("label", category),
+        ("article_url", pa.string()),
+        ("source_host", category),
+        ("cleaned_text", pa.string()),
+    ])
+
+
+# EXPORT
+def export_snapshot(directory=SNAPSHOT_DIR, fmt="parquet", chunk_size=CHUNK_SIZE):
+    """
+    Stream news_table into a new snapshot file, one row group (or record
+    batch) per chunk, plus a JSON manifest next to it, and point LATEST at
+    it. Returns the manifest.
+    """
+    pa = _pyarrow()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown snapshot format {fmt!r}; choose from {sorted(FORMATS)}")
+
+    os.makedirs(directory, exist_ok=True)
+    created = datetime.now(timezone.utc)
+    version = _new_version(directory, created)
+    path = os.path.join(directory, version + FORMATS[fmt])
+    schema = _schema(pa, fmt)
+
+    rows, max_id, labels = 0, 0, {}
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        if fmt == "parquet":
+            writer = pa.parquet.ParquetWriter(tmp_path, schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_file(tmp_path, schema)
+
+        with writer:
+            for chunk in iter_article_chunks(SOURCE_COLUMNS, chunk_size=chunk_size):
+                columns = list(zip(*chunk))
+                columns.append(preprocess_texts(columns[1]))
+                batch = pa.RecordBatch.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema,
+                )
+                if fmt == "parquet":
+                    writer.write_batch(batch)
+                else:
+                    writer.write(batch)
+
+                rows += len(chunk)
+                max_id = max(max_id, columns[0][-1])
+                for label in columns[2]:
+                    labels[label] = labels.get(label, 0) + 1
+
+        digest = file_digest(tmp_path)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    manifest = {
+        "version": version,
+        "file": os.path.basename(path),
+        "format": fmt,
+        "created_at": created.isoformat(),
+        "rows": rows,
+        "max_id": max_id,
+        "labels": labels,
+        "columns": list(schema.names),
+        "digest": digest,
+        "preprocess_digest": preprocess_digest(),
+    }
+    with open(os.path.join(directory, version + ".json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    with open(os.path.join(directory, LATEST_POINTER), "w") as f:
+        f.write(version + "\n")
+    return manifest
+
+
+# LOAD
+def read_manifest(snapshot="latest", directory=SNAPSHOT_DIR):
+    """
+    Manifest for ``snapshot``: "latest", a version name, or a path to a
+    snapshot file or its manifest. The returned dict has the resolved
+    file path under "path".
+    """
+    if snapshot == "latest":
+        pointer = os.path.join(directory, LATEST_POINTER)
+        if not os.path.exists(pointer):
+            raise FileNotFoundError(f"No snapshots in {directory}; run manage.py export_snapshot")
+        with open(pointer) as f:
+            snapshot = f.read().strip()
+
+    if os.sep in snapshot or os.path.exists(snapshot):
+        directory = os.path.dirname(os.path.abspath(snapshot))
+        snapshot = os.path.splitext(os.path.basename(snapshot))[0]
+
+    with open(os.path.join(directory, snapshot + ".json")) as f:
+        manifest = json.load(f)
+    manifest["path"] = os.path.join(directory, manifest["file"])
+
+    if manifest.get("preprocess_digest") != preprocess_digest():
+        import warnings
+        warnings.warn(f"Snapshot {manifest['version']} was cleaned by a different preprocess_text; "
+                      f"re-export it for results that match the live pipeline.")
+    return manifest
+
+
+def iter_snapshot_batches(snapshot="latest", columns=TRAINING_COLUMNS, batch_size=CHUNK_SIZE,
+                          directory=SNAPSHOT_DIR):
+    """
+    Yield pyarrow RecordBatches holding only ``columns``. Parquet is read
+    one batch at a time; Arrow files are memory-mapped, so batches are
+    zero-copy views of the page cache.
+    """
+    pa = _pyarrow()
+    manifest = read_manifest(snapshot, directory)
+    columns = list(columns)
+
+    if manifest["format"] == "parquet":
+        parquet_file = pa.parquet.ParquetFile(manifest["path"], memory_map=True)
+        yield from parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+        return
+
+    # Left open: the yielded batches point into the mapping.
+    reader = pa.ipc.open_file(pa.memory_map(manifest["path"]))
+    for i in range(reader.num_record_batches):
+        yield reader.get_batch(i).select(columns)
+
+
+def load_snapshot(snapshot="latest", columns=TRAINING_COLUMNS, directory=SNAPSHOT_DIR):
+    """
+    DataFrame of ``columns`` from a snapshot. Dictionary-encoded columns
+    come back as pandas categoricals.
+    """
+    pa = _pyarrow()
+    batches = list(iter_snapshot_batches(snapshot, columns, directory=directory))
+    if not batches:
+        import pandas as pd
+        return pd.DataFrame(columns=list(columns))
+    return pa.Table.from_batches(batches).to_pandas()
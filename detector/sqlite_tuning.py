@@ -0,0 +1,34 @@
+# PRAGMAs applied to every new SQLite connection. WAL lets readers run
+# alongside a writer, busy_timeout makes writers wait instead of failing
+# with "database is locked", and mmap/cache keep hot pages out of read().
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 20000,       # ms; the only lock wait (no "timeout" in DATABASES OPTIONS)
+    "mmap_size": 134217728,      # 128 MB
+    "cache_size": -20000,        # negative = KiB, so ~20 MB per connection
+    "temp_store": "MEMORY",
+}
+
+
+def apply_pragmas(cursor, pragmas=None):
+    """
+    Run PRAGMA statements on a DB-API cursor (Django or plain sqlite3).
+    """
+    for name, value in (DEFAULT_PRAGMAS if pragmas is None else pragmas).items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    connection_created receiver; values in settings.SQLITE_PRAGMAS, if set,
+    override individual defaults.
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    from django.conf import settings
+
+    pragmas = {**DEFAULT_PRAGMAS, **getattr(settings, "SQLITE_PRAGMAS", {})}
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, pragmas)
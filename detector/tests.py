@@ -1,3 +1,797 @@
-from django.test import TestCase
+import os
+import pickle
+import random
+import re
+import tempfile
+import time
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import scipy.sparse as sp
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.core.cache import cache
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import Client, SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.model_selection import GridSearchCV
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import normalize
+from sklearn.svm import SVC
+
+from .management.commands.importtime import ml_modules, run_importtime
+from . import history, model_training, monitoring, scrape_scheduler, shadow, snapshots, views
+from .corpus_store import CompactCorpus
+from .explain import Explainer
+from .inference_export import CompactSVC, resolve_gamma
+from .db_routers import NewsRouter
+from .news_corpus import iter_article_chunks
+from .models import NewsArticle, Prediction, Review, ShadowPrediction, ShadowSample, Source
+from .write_behind import WriteBehindBuffer
+
+
+class LazyMLImportTests(SimpleTestCase):
+    """
+    Non-ML management commands load the URLconf and views, but must not pay
+    for scikit-learn or pandas. The commands run against throwaway database
+    files, so the tracked ones are never opened (or switched to WAL).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.env = {
+            "SQLITE_PATH": os.path.join(cls.tmpdir.name, "db.sqlite3"),
+            "NEWS_DB_PATH": os.path.join(cls.tmpdir.name, "news.db"),
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+        super().tearDownClass()
+
+    def assertNoMLImports(self, *command_args):
+        heavy = ml_modules(run_importtime(list(command_args), env=self.env))
+        self.assertFalse(
+            [module for module in heavy if module.split(".")[0] in ("sklearn", "pandas")],
+            f"manage.py {' '.join(command_args)} imported ML modules",
+        )
+
+    def test_check_does_not_import_ml(self):
+        self.assertNoMLImports("check")
+
+    def test_showmigrations_does_not_import_ml(self):
+        self.assertNoMLImports("showmigrations")
+
+    def test_urlconf_does_not_import_ml(self):
+        self.assertNoMLImports("shell", "-c", "from django.urls import resolve; resolve('/check_news/')")
+
+
+class WriteBehindBufferTests(TransactionTestCase):
+    """
+    The worker thread writes through its own connection, so rows must be
+    committed for it to see the table and for the test to see its rows.
+    """
+
+    def make_buffer(self, **kwargs):
+        return WriteBehindBuffer(Review, **{"batch_size": 100, "flush_interval": 5.0, **kwargs})
+
+    def test_flush_writes_rows_held_by_the_worker(self):
+        buffer = self.make_buffer()
+        for i in range(5):
+            self.assertTrue(buffer.put(Review(name="test", review=f"review {i}")))
+        time.sleep(0.1)  # the worker has taken the rows and is waiting for more
+
+        buffer.flush()
+
+        self.assertEqual(Review.objects.count(), 5)
+        self.assertEqual(buffer.pending(), 0)
+
+    def test_flush_writes_rows_still_queued(self):
+        buffer = self.make_buffer(batch_size=2)
+        for i in range(7):
+            buffer.put(Review(name="test", review=f"review {i}"))
+
+        buffer.flush()
+
+        self.assertEqual(Review.objects.count(), 7)
+
+    def test_put_reports_a_full_buffer(self):
+        buffer = self.make_buffer(max_pending=1)
+        buffer._ensure_worker = lambda: None  # keep the row in the queue
+
+        self.assertTrue(buffer.put(Review(name="test", review="first")))
+        with self.assertLogs("detector.write_behind", "WARNING"):
+            self.assertFalse(buffer.put(Review(name="test", review="second")))
+
+        buffer.flush()
+        self.assertEqual(list(Review.objects.values_list("review", flat=True)), ["first"])
+
+
+class ReviewAPITests(TransactionTestCase):
+    """
+    /api/reviews/: cursor pages, ETag revalidation and cache invalidation
+    when the write-behind buffer flushes.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("review_api")
+        self.addCleanup(views.review_buffer.flush)
+
+    def make_reviews(self, count, created_at):
+        reviews = Review.objects.bulk_create([Review(name="test", review=f"review {i}") for i in range(count)])
+        # auto_now_add ignores explicit values, so the timestamps are set afterwards.
+        Review.objects.filter(id__in=[review.id for review in reviews]).update(created_at=created_at)
+
+    def test_cursor_pages_follow_created_at_then_id(self):
+        # Ties on created_at must be broken by id, or rows repeat across pages.
+        now = timezone.now()
+        self.make_reviews(10, now)
+        self.make_reviews(5, now - timedelta(hours=1))
+
+        seen = []
+        url = self.url + "?page_size=4"
+        while url:
+            data = self.client.get(url).json()
+            seen.extend(row["id"] for row in data["results"])
+            url = data["next"]
+
+        expected = list(Review.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(set(seen)), 15)
+
+    def test_if_none_match_returns_304(self):
+        self.make_reviews(3, timezone.now())
+
+        first = self.client.get(self.url)
+        etag = first.headers["ETag"]
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers["ETag"], etag)
+
+    def test_flush_invalidates_cached_pages(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        response = self.client.post(self.url, {"name": "api", "review": "queued review"})
+        self.assertEqual(response.status_code, 202)
+        views.review_buffer.flush()
+
+        refreshed = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertEqual([row["review"] for row in refreshed.json()["results"]], ["queued review"])
+
+    def test_post_requires_a_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+
+        self.assertEqual(client.post(self.url, {"review": "cross-site"}).status_code, 403)
+        client.get(reverse("home"))  # sets the csrftoken cookie
+        token = client.cookies["csrftoken"].value
+        response = client.post(self.url, {"review": "same-site"}, HTTP_X_CSRFTOKEN=token)
+        self.assertEqual(response.status_code, 202)
+
+    def test_posts_are_throttled_but_reads_are_not(self):
+        with mock.patch.dict(views.ReviewPostThrottle.THROTTLE_RATES, {"reviews": "2/minute"}):
+            statuses = [self.client.post(self.url, {"review": f"review {i}"}).status_code for i in range(3)]
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        self.assertEqual(statuses, [202, 202, 429])
+
+    def test_full_buffer_falls_back_to_a_direct_insert(self):
+        with mock.patch.object(views.review_buffer, "put", return_value=False):
+            response = self.client.post(self.url, {"review": "written now"})
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(list(Review.objects.values_list("name", "review")), [("Anonymous", "written now")])
+
+
+class UntrainedModelTests(TransactionTestCase):
+    """
+    With no artifact and nothing to train on, predictions are still
+    recorded, under the "untrained" version.
+    """
+
+    def test_history_records_untrained_predictions(self):
+        with mock.patch.multiple(model_training, _corpus=None, _model_version=None,
+                                 MODEL_FILE=os.path.join(tempfile.gettempdir(), "missing-model.pkl")), \
+                mock.patch.object(model_training, "train_model", return_value=(None, None, None)):
+            self.assertEqual(model_training.get_model(), (None, None, None))
+            history.record("some headline", {"label": "UNKNOWN", "reason": "Model not available"}, 1.0)
+            history.flush()
+
+        self.assertEqual(list(Prediction.objects.values_list("model_version", flat=True)), ["untrained"])
+
+
+class ScrapeScheduleTests(SimpleTestCase):
+    def test_adapt_interval_moves_towards_the_target_yield(self):
+        self.assertEqual(scrape_scheduler.adapt_interval(3600, 5), 3600)
+        self.assertEqual(scrape_scheduler.adapt_interval(3600, 20), 1800)  # capped at MAX_STEP
+        self.assertEqual(scrape_scheduler.adapt_interval(3600, 3), 6000)
+        self.assertEqual(scrape_scheduler.adapt_interval(3600, 0), 7200)
+
+    def test_adapt_interval_stays_within_bounds(self):
+        self.assertEqual(scrape_scheduler.adapt_interval(700, 50), scrape_scheduler.MIN_INTERVAL)
+        self.assertEqual(scrape_scheduler.adapt_interval(80000, 0), scrape_scheduler.MAX_INTERVAL)
+
+    def test_record_failure_backs_off_exponentially(self):
+        source = Source(url="https://example.com/news", label="real", interval=3600)
+        now = timezone.now()
+        delays = []
+        with mock.patch.object(scrape_scheduler, "_jittered", lambda seconds: seconds):
+            for _ in range(12):
+                scrape_scheduler.record_failure(source, ValueError("x" * 2000), now)
+                delays.append((source.next_due_at - now).total_seconds())
+
+        base = scrape_scheduler.RETRY_BASE
+        self.assertEqual(delays[:3], [base, base * 2, base * 4])
+        self.assertEqual(delays[-1], scrape_scheduler.MAX_INTERVAL)
+        self.assertEqual(source.consecutive_failures, 12)
+        self.assertEqual(source.interval, 3600)
+        self.assertEqual(len(source.last_error), 1000)
+
+
+class ScrapeStorageTests(TransactionTestCase):
+    databases = {"default", "news_db"}
+
+    def article(self, n, label="real"):
+        return {"text": f"Headline number {n}", "label": label,
+                "article_url": f"https://news.example.com/story-{n}"}
+
+    def test_store_articles_skips_known_urls(self):
+        now = timezone.now()
+        self.assertEqual(scrape_scheduler.store_articles([self.article(1), self.article(2)], now), 2)
+        self.assertEqual(scrape_scheduler.store_articles([self.article(2), self.article(3)], now), 1)
+
+        self.assertEqual(NewsArticle.objects.count(), 3)
+        self.assertEqual(set(NewsArticle.objects.values_list("source_host", flat=True)), {"news.example.com"})
+
+    def test_one_failing_source_does_not_abort_the_cycle(self):
+        broken = Source.objects.create(url="https://broken.example.com/", label="fake")
+        working = Source.objects.create(url="https://news.example.com/", label="real")
+
+        def fetch(url, label, etag, last_modified):
+            if url == broken.url:
+                raise ValueError("unparseable page")
+            return [self.article(1)], "etag-1", ""
+
+        with mock.patch.object(scrape_scheduler, "fetch_headlines", fetch), \
+                self.assertLogs("detector.scrape_scheduler", "ERROR"):
+            results = {source.url: (new_count, error) for source, new_count, error
+                       in scrape_scheduler.run_cycle(workers=2)}
+
+        self.assertIsInstance(results[broken.url][1], ValueError)
+        self.assertEqual(results[working.url], (1, None))
+        broken.refresh_from_db()
+        working.refresh_from_db()
+        self.assertEqual((broken.consecutive_failures, broken.last_error), (1, "unparseable page"))
+        self.assertEqual((working.consecutive_failures, working.etag), (0, "etag-1"))
+        self.assertEqual(NewsArticle.objects.count(), 1)
+
+
+class SnapshotVersionTests(TransactionTestCase):
+    databases = {"default", "news_db"}
+
+    def test_exports_in_the_same_instant_get_distinct_versions(self):
+        NewsArticle.objects.create(text="A headline", label="real", article_url="https://example.com/a")
+        created = datetime(2026, 1, 2, 3, 4, 5, 678900, tzinfo=dt_timezone.utc)
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(snapshots, "datetime", wraps=datetime) as clock:
+            clock.now.return_value = created
+            first = snapshots.export_snapshot(directory)
+            second = snapshots.export_snapshot(directory)
+
+            self.assertEqual(first["version"], "news-20260102T030405678900Z")
+            self.assertEqual(second["version"], "news-20260102T030405678900Z-2")
+            self.assertEqual(snapshots.read_manifest(first["version"], directory)["digest"], first["digest"])
+            self.assertEqual(snapshots.read_manifest("latest", directory)["version"], second["version"])
+
+
+@override_settings(MONITORING={"TOKEN": "s3cret"})
+class MonitoringStatsTests(TransactionTestCase):
+    url = reverse("monitoring_stats")
+
+    def test_hidden_without_a_valid_token(self):
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get(self.url, HTTP_X_MONITORING_TOKEN="wrong").status_code, 404)
+
+    @override_settings(MONITORING={"TOKEN": ""})
+    def test_an_empty_token_setting_admits_nobody(self):
+        self.assertEqual(self.client.get(self.url, HTTP_X_MONITORING_TOKEN="").status_code, 404)
+
+    def test_token_holder_gets_this_workers_counters(self):
+        response = self.client.get(self.url, HTTP_X_MONITORING_TOKEN="s3cret")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["pid"], os.getpid())
+
+    def test_staff_session_needs_no_token(self):
+        staff = User.objects.create_user("ops", password="pw", is_staff=True)
+        self.client.force_login(staff)
+
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_only_get_is_allowed(self):
+        response = self.client.post(self.url, HTTP_X_MONITORING_TOKEN="s3cret")
+        self.assertEqual(response.status_code, 405)
+
+
+class RepeatQueryTests(TransactionTestCase):
+    """
+    A text already answered under the current model version is served from
+    history instead of running the model again.
+    """
+
+    url = reverse("check_news")
+    result = {"label": "FAKE", "confidence": 91.5, "reason": "Sensational wording",
+              "source": "ML Model", "article_url": ""}
+
+    def setUp(self):
+        history._recent.clear()
+        self.addCleanup(history.flush)  # before the tables are emptied for the next test
+        self.addCleanup(history._recent.clear)
+        self.predict = self.patch(views, "predict_news", return_value=dict(self.result))
+        self.version = self.patch(history, "get_model_version", return_value="v1")
+        self.patch(views.monitoring, "observe")
+        self.patch(views.shadow, "sample")
+
+    def patch(self, target, name, **kwargs):
+        patcher = mock.patch.object(target, name, **kwargs)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def check(self, text):
+        response = self.client.post(self.url, {"news_text": text})
+        self.assertTrue(response.json()["success"])
+        return response.json()
+
+    def test_repeat_text_skips_the_model(self):
+        first = self.check("Aliens  land in Paris")
+        second = self.check("aliens land in paris")
+
+        self.assertEqual(self.predict.call_count, 1)
+        self.assertEqual(second, first)
+
+    def test_repeat_text_is_found_in_the_database(self):
+        self.check("Aliens land in Paris")
+        history.flush()
+        history._recent.clear()
+
+        self.check("Aliens land in Paris")
+
+        self.assertEqual(self.predict.call_count, 1)
+        self.assertEqual(Prediction.objects.get().model_version, "v1")
+
+    def test_new_model_version_misses(self):
+        self.check("Aliens land in Paris")
+        self.version.return_value = "v2"
+
+        self.check("Aliens land in Paris")
+
+        self.assertEqual(self.predict.call_count, 2)
+
+
+class NewsRouterTests(SimpleTestCase):
+    router = NewsRouter()
+
+    def test_corpus_models_use_news_db(self):
+        for model in (NewsArticle, Source):
+            self.assertEqual(self.router.db_for_read(model), "news_db")
+            self.assertEqual(self.router.db_for_write(model), "news_db")
+        for model in (Review, Prediction):
+            self.assertEqual(self.router.db_for_read(model), "default")
+            self.assertEqual(self.router.db_for_write(model), "default")
+
+    def test_models_migrate_only_in_their_database(self):
+        self.assertTrue(self.router.allow_migrate("news_db", "detector", "newsarticle"))
+        self.assertFalse(self.router.allow_migrate("default", "detector", "newsarticle"))
+        self.assertTrue(self.router.allow_migrate("default", "detector", "review"))
+        self.assertFalse(self.router.allow_migrate("news_db", "detector", "review"))
+        self.assertTrue(self.router.allow_migrate("default", "auth", "user"))
+
+    def test_relations_stay_within_one_database(self):
+        self.assertFalse(self.router.allow_relation(NewsArticle(), Review()))
+        self.assertTrue(self.router.allow_relation(NewsArticle(), Source()))
+
+
+class NewsCorpusTests(TransactionTestCase):
+    databases = {"default", "news_db"}
+
+    def make_articles(self, count, label="real"):
+        NewsArticle.objects.bulk_create([
+            NewsArticle(text=f"{label} headline {i}", label=label, article_url=f"https://example.com/{label}/{i}")
+            for i in range(count)
+        ])
+
+    def test_chunks_cover_every_row_in_id_order(self):
+        self.make_articles(5)
+
+        chunks = list(iter_article_chunks(("id", "text"), chunk_size=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        ids = [row[0] for chunk in chunks for row in chunk]
+        self.assertEqual(ids, sorted(NewsArticle.objects.values_list("id", flat=True)))
+
+    def test_no_empty_chunk_at_an_exact_boundary(self):
+        self.make_articles(4)
+
+        self.assertEqual([len(chunk) for chunk in iter_article_chunks(chunk_size=2)], [2, 2])
+
+    def test_filters_are_applied(self):
+        self.make_articles(3, "real")
+        self.make_articles(2, "fake")
+
+        chunks = list(iter_article_chunks(("label",), chunk_size=10, label="fake"))
+
+        self.assertEqual(chunks, [[("fake",), ("fake",)]])
+        self.assertEqual(list(iter_article_chunks(label="satire")), [])
+
+
+class SQLiteTuningTests(SimpleTestCase):
+    """
+    The test databases live in memory, where journal_mode cannot be WAL,
+    so this opens its own connection to a file.
+    """
+
+    def test_new_connections_get_the_pragmas(self):
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = DatabaseWrapper({**connection.settings_dict, "NAME": os.path.join(directory, "t.sqlite3")},
+                                      alias="pragma_check")
+            try:
+                with wrapper.cursor() as cursor:
+                    journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+                    busy_timeout = cursor.execute("PRAGMA busy_timeout").fetchone()[0]
+            finally:
+                wrapper.close()
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(busy_timeout, 20000)
+
+
+class CompactCorpusTests(SimpleTestCase):
+    def test_urls_and_labels_round_trip(self):
+        urls = ["https://example.com/a", "", None, "https://example.in/समाचार-ताज़ा", "https://example.com/é"]
+        labels = ["real", "fake", "real", "fake", "real"]
+        corpus = CompactCorpus.build(urls, labels, sp.identity(len(urls), format="csr"))
+
+        self.assertEqual(len(corpus), 5)
+        self.assertEqual([corpus.url(i) for i in range(5)], [url or "" for url in urls])
+        self.assertEqual([corpus.label(i) for i in range(5)], labels)
+        self.assertEqual(corpus.row(3), {"article_url": urls[3], "label": "fake"})
+
+    def test_closest_matches_cosine_similarity(self):
+        rng = random.Random(0)
+        words = [f"word{i}" for i in range(300)]
+        texts = [" ".join(rng.choices(words, k=12)) for _ in range(400)]
+        queries = [" ".join(rng.choices(words, k=6)) for _ in range(100)]
+        vectorizer = TfidfVectorizer().fit(texts)
+        vectors = vectorizer.transform(texts)
+        corpus = CompactCorpus.build([f"https://example.com/{i}" for i in range(len(texts))],
+                                     ["real"] * len(texts), vectors)
+
+        for query in queries:
+            input_vec = vectorizer.transform([query])
+            self.assertEqual(corpus.closest(input_vec), cosine_similarity(input_vec, vectors).argmax())
+
+
+class BuildVectorizerTests(SimpleTestCase):
+    texts = ["stock markets rally today", "aliens built the pyramids", "markets fall on rate fears",
+             "miracle cure hidden by doctors", "rate decision due today", "secret cure for aging found"]
+    labels = ["real", "fake", "real", "fake", "real", "fake"]
+
+    def steps(self, config):
+        vectorizer = model_training.build_vectorizer(config)
+        return [name for name, _ in vectorizer.steps] if isinstance(vectorizer, Pipeline) else None
+
+    def test_pipeline_shape_per_config(self):
+        self.assertIsInstance(model_training.build_vectorizer({"min_df": 1}), TfidfVectorizer)
+        self.assertEqual(self.steps({"selector": "chi2"}), ["tfidf", "select", "norm"])
+        self.assertEqual(self.steps({"selector": "l1"}), ["tfidf", "select", "norm"])
+        self.assertEqual(self.steps({"hashing": True}), ["hash", "tfidf"])
+        self.assertEqual(self.steps({"hashing": True, "selector": "chi2"}), ["hash", "tfidf", "select", "norm"])
+
+    def test_config_reaches_the_steps(self):
+        tfidf = model_training.build_vectorizer({"min_df": 3, "max_df": 0.5, "max_features": 100})
+        self.assertEqual((tfidf.min_df, tfidf.max_df, tfidf.max_features), (3, 0.5, 100))
+        hashed = model_training.build_vectorizer({"hashing": True, "hash_bits": 10})
+        self.assertEqual(hashed.named_steps["hash"].n_features, 1024)
+
+    def test_selector_keeps_k_unit_length_features(self):
+        vectorizer = model_training.build_vectorizer({"min_df": 1, "selector": "chi2", "k": 4})
+        features = vectorizer.fit_transform(self.texts, self.labels)
+
+        self.assertEqual(features.shape, (len(self.texts), 4))
+        norms = np.sqrt(features.multiply(features).sum(axis=1)).A.ravel()
+        self.assertTrue(np.allclose(norms[norms > 0], 1.0))
+
+    def test_unknown_selector_is_rejected(self):
+        with self.assertRaisesMessage(ValueError, "Unknown feature selector: 'pca'"):
+            model_training.build_vectorizer({"selector": "pca"})
+
+
+class CompactSVCTests(SimpleTestCase):
+    """
+    CompactSVC re-implements libsvm's decision function, Platt scaling and
+    pairwise coupling; it must agree with sklearn on fresh fits.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        X = sp.random(160, 40, density=0.15, format="csr", random_state=np.random.RandomState(0))
+        cls.X = normalize(X)
+        weights = np.random.RandomState(1).normal(size=40)
+        cls.y = np.where(cls.X @ weights > 0, "fake", "real")
+        cls.X_test = normalize(sp.random(60, 40, density=0.15, format="csr",
+                                         random_state=np.random.RandomState(2)))
+
+    def assertMatchesSVC(self, model, compact):
+        np.testing.assert_array_equal(compact.predict(self.X_test), model.predict(self.X_test))
+        np.testing.assert_allclose(compact.predict_proba(self.X_test), model.predict_proba(self.X_test), atol=1e-5)
+
+    def test_rbf_kernel_matches_sklearn(self):
+        for gamma in ("scale", "auto", 0.7):
+            with self.subTest(gamma=gamma):
+                model = SVC(kernel="rbf", gamma=gamma, probability=True, random_state=0).fit(self.X, self.y)
+                self.assertAlmostEqual(resolve_gamma(model, self.X), model._gamma)
+                self.assertMatchesSVC(model, CompactSVC(model, X=self.X))
+
+    def test_linear_kernel_matches_sklearn(self):
+        model = SVC(kernel="linear", probability=True, random_state=0).fit(self.X, self.y)
+        self.assertMatchesSVC(model, CompactSVC(model, X=self.X))
+
+    def test_stored_gamma_needs_no_training_matrix(self):
+        model = SVC(probability=True, random_state=0).fit(self.X, self.y)
+
+        self.assertMatchesSVC(model, CompactSVC(model, gamma=resolve_gamma(model, self.X)))
+        with self.assertRaises(ValueError):
+            CompactSVC(model)
+
+
+class ExplainerTests(SimpleTestCase):
+    fake_words = {"shocking", "miracle", "secret"}
+    real_words = {"minister", "parliament", "budget"}
+    texts = [
+        "shocking miracle cure", "secret miracle revealed", "shocking secret plot", "miracle secret shocking",
+        "minister presents budget", "parliament debates budget", "minister addresses parliament",
+        "budget parliament minister",
+    ]
+
+    def explainer(self, labels):
+        vectorizer = TfidfVectorizer().fit(self.texts)
+        return vectorizer, Explainer.fit(vectorizer, vectorizer.transform(self.texts), np.array(labels))
+
+    def test_phrases_favour_the_predicted_label(self):
+        vectorizer, explainer = self.explainer(["fake"] * 4 + ["real"] * 4)
+        self.assertEqual(explainer.classes, ("FAKE", "REAL"))
+        input_vec = vectorizer.transform(["shocking secret budget minister"])
+
+        self.assertEqual(set(explainer.top_phrases(input_vec, "FAKE")), {"shocking", "secret"})
+        self.assertEqual(set(explainer.top_phrases(input_vec, "REAL")), {"budget", "minister"})
+        self.assertTrue(explainer.reason(input_vec, "FAKE").startswith("Wording typical of debunked claims"))
+
+    def test_sign_follows_class_order(self):
+        # The first four rows' label sorts first ("a"), then last ("z").
+        for first, second in (("a", "b"), ("z", "y")):
+            with self.subTest(labels=(first, second)):
+                vectorizer, explainer = self.explainer([first] * 4 + [second] * 4)
+                input_vec = vectorizer.transform(["miracle parliament"])
+
+                self.assertEqual(explainer.top_phrases(input_vec, first), ["miracle"])
+                self.assertEqual(explainer.top_phrases(input_vec, second), ["parliament"])
+
+
+class TrainDetectorTests(TransactionTestCase):
+    databases = {"default", "news_db"}
+
+    def setUp(self):
+        rng = random.Random(0)
+        vocab = {"fake": ["shocking", "miracle", "secret", "hoax", "viral", "exposed"],
+                 "real": ["minister", "budget", "parliament", "court", "report", "policy"]}
+        NewsArticle.objects.bulk_create([
+            NewsArticle(text=" ".join(rng.choices(vocab[label], k=5)), label=label,
+                        article_url=f"https://example.com/{label}/{i}")
+            for label in vocab for i in range(20)
+        ])
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.output = os.path.join(self.tmpdir.name, "model.pkl")
+
+    def train(self, *args):
+        out = StringIO()
+        call_command("train_detector", "--output", self.output, *args, stdout=out)
+        return out.getvalue()
+
+    def test_writes_a_loadable_artifact(self):
+        output = self.train("--jobs", "1")
+
+        artifact = model_training.load_artifact(self.output)
+        self.assertEqual(len(artifact["corpus"]), 40)
+        self.assertEqual(set(artifact["model"].classes_), {"fake", "real"})
+        self.assertIn("preprocessed 40/40 rows", output)
+
+    def test_default_chunks_spread_rows_over_jobs(self):
+        output = self.train("--jobs", "3")
+
+        self.assertEqual(re.findall(r"preprocessed (\d+)/40", output), ["14", "28", "40"])
+
+    def test_search_refits_a_selector_per_fold(self):
+        with mock.patch.dict(model_training.FEATURE_CONFIG, {"selector": "chi2", "k": 5}), \
+                mock.patch("sklearn.model_selection.GridSearchCV", wraps=GridSearchCV) as grid_search:
+            self.train("--jobs", "1", "--search", "--cv", "2")
+
+        estimator = grid_search.call_args.args[0]
+        self.assertIsInstance(estimator, Pipeline)
+        self.assertEqual(list(estimator.named_steps), ["features", "svc"])
+        self.assertTrue(os.path.exists(self.output))
+
+
+class SaveArtifactTests(SimpleTestCase):
+    def test_replaces_the_file_in_one_step(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model.pkl")
+            model_training.save_artifact({"version": 1}, path)
+            model_training.save_artifact({"version": 2}, path)
+
+            with open(path, "rb") as f:
+                self.assertEqual(pickle.load(f), {"version": 2})
+            self.assertEqual(os.listdir(directory), ["model.pkl"])
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o644)
+
+    def test_failed_write_keeps_the_old_artifact(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model.pkl")
+            model_training.save_artifact({"version": 1}, path)
+
+            with self.assertRaises(Exception):
+                model_training.save_artifact({"version": 2, "model": lambda: None}, path)
+
+            with open(path, "rb") as f:
+                self.assertEqual(pickle.load(f), {"version": 1})
+            self.assertEqual(os.listdir(directory), ["model.pkl"])
+
+
+@mock.patch.multiple(shadow, ARTIFACT="candidate.pkl", SAMPLE_RATE=1.0)
+class ShadowSamplingTests(TransactionTestCase):
+    result = {"label": "FAKE", "confidence": 80.0, "source": "ML Model", "reason": ""}
+
+    def setUp(self):
+        shadow._deferred.items = []
+        version = mock.patch.object(shadow, "get_model_version", return_value="v1")
+        version.start()
+        self.addCleanup(version.stop)
+
+    def test_nothing_is_queued_before_the_response_is_sent(self):
+        with mock.patch.object(shadow._samples, "put") as put:
+            shadow.sample("Aliens land in Paris", self.result)
+            put.assert_not_called()
+
+            request_finished.send(sender=None)
+
+        sample = put.call_args.args[0]
+        self.assertEqual((sample.text, sample.primary_label, sample.primary_confidence, sample.primary_version),
+                         ("Aliens land in Paris", "FAKE", 80.0, "v1"))
+        self.assertEqual(shadow._deferred.items, [])
+
+    def test_answers_without_the_model_are_skipped(self):
+        with mock.patch.object(shadow._samples, "put") as put:
+            shadow.sample("text", {**self.result, "source": "Rule-based"})
+            shadow.sample("text", {"label": "UNKNOWN", "reason": "Model not available"})
+            request_finished.send(sender=None)
+
+        put.assert_not_called()
+
+    def test_disabled_without_a_candidate(self):
+        with mock.patch.object(shadow, "ARTIFACT", ""), mock.patch.object(shadow._samples, "put") as put:
+            shadow.sample("text", self.result)
+            request_finished.send(sender=None)
+
+        put.assert_not_called()
+
+    def test_shadow_score_compares_and_consumes_samples(self):
+        texts = ["shocking miracle hoax", "secret miracle exposed", "shocking secret hoax", "miracle exposed hoax",
+                 "minister budget report", "parliament court policy", "budget policy report", "court minister policy"]
+        labels = ["fake"] * 4 + ["real"] * 4
+        vectorizer = TfidfVectorizer().fit(texts)
+        model = SVC(kernel="linear", probability=True, random_state=0).fit(vectorizer.transform(texts * 3), labels * 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "candidate.pkl")
+            model_training.save_artifact({"corpus": None, "vectorizer": vectorizer, "model": model,
+                                          "explainer": None}, path)
+            shadow.sample("Shocking miracle hoax", self.result)
+            shadow.sample("Minister presents budget report", self.result)
+            request_finished.send(sender=None)
+            shadow.flush()
+            self.assertEqual(ShadowSample.objects.count(), 2)
+
+            call_command("shadow_score", "--artifact", path, stdout=StringIO())
+            candidate_version = model_training.file_digest(path)
+
+        self.assertEqual(ShadowSample.objects.count(), 0)
+        rows = ShadowPrediction.objects.order_by("id")
+        self.assertEqual([(row.candidate_label, row.agreed) for row in rows], [("FAKE", True), ("REAL", False)])
+        self.assertEqual({row.candidate_version for row in rows}, {candidate_version})
+
+
+class DriftMonitorTests(SimpleTestCase):
+    def make_monitor(self):
+        return monitoring.DriftMonitor(window_seconds=60, windows=3)
+
+    def test_observations_roll_over_into_new_windows(self):
+        monitor = self.make_monitor()
+        monitor.observe("FAKE", 90, rule_hit=False, now=100)
+        monitor.observe("REAL", 70, rule_hit=False, now=119.9)
+        monitor.observe("FAKE", 100, rule_hit=True, now=120)
+
+        snapshot = monitor.snapshot(now=130)
+
+        self.assertEqual([(w["start"], w["requests"]) for w in snapshot["windows"]], [(60, 2), (120, 1)])
+        self.assertEqual(snapshot["total"]["requests"], 3)
+        self.assertEqual(snapshot["total"]["rule_hit_rate"], 1 / 3)
+        self.assertEqual(snapshot["total"]["label_mix"], {"FAKE": 2 / 3, "REAL": 1 / 3})
+
+    def test_old_windows_age_out(self):
+        monitor = self.make_monitor()
+        for now in (0, 60, 120, 180):
+            monitor.observe("FAKE", 90, rule_hit=False, now=now)
+
+        # The ring keeps three windows; the snapshot also drops idle ones older than 3 x 60s.
+        self.assertEqual([w["start"] for w in monitor.snapshot(now=200)["windows"]], [60, 120, 180])
+        self.assertEqual([w["start"] for w in monitor.snapshot(now=300)["windows"]], [120, 180])
+        empty = monitor.snapshot(now=1000)
+        self.assertEqual((empty["windows"], empty["total"]["requests"], empty["total"]["oov_rate"]), ([], 0, None))
+
+    def test_histogram_buckets(self):
+        monitor = self.make_monitor()
+        monitor.observe("FAKE", 0, rule_hit=False, tokens=4, oov_tokens=0, now=0)
+        monitor.observe("FAKE", 95, rule_hit=False, tokens=4, oov_tokens=1, now=0)
+        monitor.observe("REAL", 100, rule_hit=False, tokens=2, oov_tokens=2, now=0)
+        monitor.observe("REAL", 100, rule_hit=True, now=0)  # rule answers are not bucketed
+
+        total = monitor.snapshot(now=0)["total"]
+
+        self.assertEqual(total["confidence_histogram"], [1, 0, 0, 0, 0, 0, 0, 0, 0, 2])
+        self.assertEqual(total["oov_histogram"], [1, 0, 1, 0, 0, 0, 0, 0, 0, 1])
+        self.assertEqual(total["oov_rate"], 3 / 10)
+        self.assertEqual(total["model_requests"], 3)
+
+
+class OOVCountTests(SimpleTestCase):
+    corpus = ["Markets rally as budget passes", "Minister presents the budget", "Markets fall on rate fears"]
+
+    def count(self, vectorizer, text, version="v1"):
+        with mock.patch.object(monitoring, "_vocabulary", (None, None, None, None)), \
+                mock.patch.object(monitoring, "get_model_version", return_value=version), \
+                mock.patch.object(monitoring, "get_model", return_value=(None, vectorizer, None)):
+            return monitoring.oov_counts(text)
+
+    def test_counts_unigrams_outside_the_fitted_vocabulary(self):
+        vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2)).fit(self.corpus)
+
+        # "the" and "on" are stop words; "crash" and "moon" were never seen.
+        self.assertEqual(self.count(vectorizer, "Markets CRASH on the moon!"), (3, 2))
+        self.assertEqual(self.count(vectorizer, "budget markets"), (2, 0))
+        self.assertEqual(self.count(vectorizer, "the"), (0, 0))
+
+    def test_feature_pipeline_uses_its_vectorizer(self):
+        vectorizer = model_training.build_vectorizer({"min_df": 1, "selector": "chi2", "k": 2})
+        vectorizer.fit(self.corpus, ["real", "real", "fake"])
+
+        self.assertEqual(self.count(vectorizer, "markets crash"), (2, 1))
+
+    def test_hashed_features_have_no_vocabulary(self):
+        vectorizer = model_training.build_vectorizer({"hashing": True, "hash_bits": 8}).fit(self.corpus)
+
+        self.assertEqual(self.count(vectorizer, "markets crash"), (0, 0))
@@ -5,4 +5,6 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('submit_review/', views.submit_review, name='submit_review'),
     path('check_news/', views.check_news, name='check_news'),
+    path('api/reviews/', views.ReviewListCreateView.as_view(), name='review_api'),
+    path('monitoring/stats/', views.monitoring_stats, name='monitoring_stats'),
 ]
@@ -1,10 +1,32 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.http import JsonResponse
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework import generics, status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.throttling import AnonRateThrottle
 from urllib.parse import urlparse
 from .models import Review
 from .model_training import predict_news
+from .serializers import ReviewSerializer
+from .write_behind import WriteBehindBuffer
+from . import history, monitoring, shadow
+import hashlib
+import hmac
+import json
+import logging
 import random
+import time
+
+logger = logging.getLogger(__name__)
+
+REVIEW_CACHE_TTL = 30  # seconds; bounds staleness when workers do not share a cache
+REVIEW_CACHE_VERSION_KEY = "reviews:version"
 
 
 def clean_source(url):
@@ -14,6 +36,55 @@ def clean_source(url):
         return "Unknown Source"
 
 
+# REVIEW CACHE
+def reviews_cache_version():
+    version = cache.get(REVIEW_CACHE_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(REVIEW_CACHE_VERSION_KEY, version, None)
+    return version
+
+def invalidate_review_cache(batch=None):
+    try:
+        cache.incr(REVIEW_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(REVIEW_CACHE_VERSION_KEY, 2, None)
+
+
+# REVIEW BUFFER (bursts of submissions are bulk-inserted in the background)
+review_buffer = WriteBehindBuffer.from_settings(Review, on_flush=invalidate_review_cache)
+
+def enqueue_review(name="Anonymous", review=""):
+    """
+    Queue a review for the batched insert. If the buffer is full, it is
+    written synchronously instead, so an acknowledged review is never
+    dropped. Returns False only if that write fails.
+    """
+    obj = Review(name=name or "Anonymous", review=review)
+    if review_buffer.put(obj):
+        return True
+    try:
+        obj.save()
+    except DatabaseError:
+        logger.exception("Could not save review")
+        return False
+    invalidate_review_cache()
+    return True
+
+
+# PREDICT (served from history when this text was already seen by the current model)
+def run_prediction(news_text):
+    result = history.lookup(news_text)
+    if result is None:
+        start = time.perf_counter()
+        result = predict_news(news_text)
+        history.record(news_text, result, (time.perf_counter() - start) * 1000)
+
+    monitoring.observe(news_text, result)
+    shadow.sample(news_text, result)
+    return result
+
+
 def home(request):
     news_text = ""
     result = None
@@ -32,11 +103,12 @@ def home(request):
             name = request.POST.get("name", "Anonymous").strip()
             review_text = request.POST.get("review", "").strip()
 
-            if review_text:
-                Review.objects.create(name=name or "Anonymous", review=review_text)
+            if not review_text:
+                messages.error(request, "Please write a review.")
+            elif enqueue_review(name, review_text):
                 messages.success(request, "Thanks! Review submitted.")
             else:
-                messages.error(request, "Please write a review.")
+                messages.error(request, "Sorry, your review could not be saved. Please try again.")
 
             return redirect("home")
 
@@ -44,7 +116,7 @@ def home(request):
             news_text = request.POST.get("news_text", "").strip()
 
             if news_text:
-                result = predict_news(news_text)
+                result = run_prediction(news_text)
 
                 if result.get("article_url"):
                     result["source"] = clean_source(result.get("article_url"))
@@ -62,15 +134,91 @@ def submit_review(request):
         name = request.POST.get("name", "Anonymous").strip()
         review_text = request.POST.get("review", "").strip()
 
-        if review_text:
-            Review.objects.create(name=name or "Anonymous", review=review_text)
-            return JsonResponse({"success": True})
-        else:
+        if not review_text:
             return JsonResponse({"success": False, "error": "Review cannot be empty"})
+        if not enqueue_review(name, review_text):
+            return JsonResponse({"success": False, "error": "Review could not be saved"}, status=503)
+        return JsonResponse({"success": True})
 
     return JsonResponse({"success": False, "error": "Invalid request"})
 
 
+# REVIEW API
+class ReviewCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+
+class CsrfSessionAuthentication(SessionAuthentication):
+    """
+    SessionAuthentication checks CSRF only for logged-in users. Reviews are
+    posted anonymously, so check it for every unsafe request, as the
+    submit_review form view does.
+    """
+
+    def authenticate(self, request):
+        self.enforce_csrf(request)
+        return super().authenticate(request)
+
+
+class ReviewPostThrottle(AnonRateThrottle):
+    """
+    Limits review POSTs per client IP (rate "reviews" in
+    REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']); reads are not throttled.
+    """
+
+    scope = "reviews"
+
+    def allow_request(self, request, view):
+        if request.method in ("GET", "HEAD", "OPTIONS"):
+            return True
+        return super().allow_request(request, view)
+
+
+class ReviewListCreateView(generics.ListCreateAPIView):
+    """
+    GET lists reviews newest first with cursor pagination; pages are cached
+    until the next write and carry an ETag for conditional GETs.
+    POST needs a CSRF token, is rate limited per client and queues the
+    review for a batched insert (202 Accepted).
+    """
+
+    queryset = Review.objects.all()
+    serializer_class = ReviewSerializer
+    pagination_class = ReviewCursorPagination
+    authentication_classes = [CsrfSessionAuthentication]
+    throttle_classes = [ReviewPostThrottle]
+
+    def list(self, request, *args, **kwargs):
+        cache_key = f"reviews:{reviews_cache_version()}:{request.get_full_path()}"
+        cached = cache.get(cache_key)
+
+        if cached is None:
+            data = super().list(request, *args, **kwargs).data
+            body = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            cached = (etag, data)
+            cache.set(cache_key, cached, REVIEW_CACHE_TTL)
+
+        etag, data = cached
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(data, headers=headers)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if not enqueue_review(**serializer.validated_data):
+            return Response({"detail": "Review could not be saved."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
 # AJAX CHECK NEWS
 def check_news(request):
     try:
@@ -82,7 +230,7 @@ def check_news(request):
         if not news_text:
             return JsonResponse({"success": False, "error": "Empty news input"})
 
-        result = predict_news(news_text)
+        result = run_prediction(news_text)
 
         url = result.get("article_url", "")
         confidence = result.get("confidence", 0)
@@ -106,4 +254,21 @@ def check_news(request):
 
     except Exception as e:
         print("CHECK_NEWS ERROR:", str(e))
-        return JsonResponse({"success": False, "error": "Something went wrong"})
\ No newline at end of file
+        return JsonResponse({"success": False, "error": "Something went wrong"})
+
+
+# DRIFT MONITORING (this worker's in-memory counters; no database access)
+@require_GET
+def monitoring_stats(request):
+    """
+    Staff sessions, or a request whose X-Monitoring-Token header matches
+    MONITORING['TOKEN'], get the counters of the worker that answered; the
+    response carries its pid. There is no cross-worker total: a collector
+    polls until it has seen every worker's pid and adds up windows with the
+    same start. A worker's counters restart with the worker.
+    """
+    token = getattr(settings, "MONITORING", {}).get("TOKEN", "")
+    given = request.headers.get("X-Monitoring-Token", "")
+    if not request.user.is_staff and not (token and hmac.compare_digest(given, token)):
+        raise Http404
+    return JsonResponse(monitoring.stats())
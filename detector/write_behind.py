@@ -0,0 +1,162 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Put by flush() to wake a worker that is waiting for its batch to fill.
+_FLUSH = object()
+
+
+class WriteBehindBuffer:
+    """
+    Collects unsaved model instances and bulk-inserts them from a background
+    thread, so the request path only pays for a queue put.
+    """
+
+    def __init__(self, model, batch_size=100, flush_interval=1.0,
+                 max_pending=10000, on_flush=None, flush_timeout=10.0):
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.on_flush = on_flush
+        self.flush_timeout = flush_timeout
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+        atexit.register(self.flush)
+
+    @classmethod
+    def from_settings(cls, model, **overrides):
+        """
+        A buffer sized by settings.WRITE_BEHIND; keyword arguments (such as
+        on_flush) are passed through and take precedence.
+        """
+        config = getattr(settings, "WRITE_BEHIND", {})
+        return cls(model, **{
+            "batch_size": config.get("BATCH_SIZE", 100),
+            "flush_interval": config.get("FLUSH_INTERVAL", 1.0),
+            "max_pending": config.get("MAX_PENDING", 10000),
+            **overrides,
+        })
+
+    def put(self, obj):
+        """
+        Enqueue one instance and return True. Never blocks: when the buffer
+        is full the row is not queued, a warning is logged and False is
+        returned so the caller can decide what to do with it.
+        """
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(obj)
+        except queue.Full:
+            logger.warning("%s write-behind buffer full, row not queued", self.model.__name__)
+            return False
+        return True
+
+    def flush(self):
+        """
+        Write everything put so far before returning: rows still queued are
+        written from the calling thread, then this waits (up to
+        ``flush_timeout`` seconds) for the batch the worker thread is holding.
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            for start in range(0, len(batch), self.batch_size):
+                self._write(batch[start:start + self.batch_size])
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+        worker = self._worker
+        if worker is None or self._worker_pid != os.getpid() or not worker.is_alive():
+            return  # no thread in this process holds rows
+        try:
+            self._queue.put_nowait(_FLUSH)
+        except queue.Full:
+            pass  # the worker has plenty to do and will not sit on a partial batch
+        if not self._wait_idle(self.flush_timeout):
+            logger.warning("%s write-behind flush timed out with rows in flight", self.model.__name__)
+
+    def _wait_idle(self, timeout):
+        # Queue.join() without the unbounded wait: every put is matched by a
+        # task_done() once its row has been written (or failed to write).
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def pending(self):
+        """
+        Rows put but not yet written, including a batch the worker holds.
+        """
+        return self._queue.unfinished_tasks
+
+    def _ensure_worker(self):
+        # Threads do not survive fork, so a buffer created before gunicorn
+        # forks its workers needs a fresh thread in each child.
+        pid = os.getpid()
+        if self._worker is not None and self._worker_pid == pid and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker_pid == pid and self._worker.is_alive():
+                return
+            if self._worker_pid is not None and self._worker_pid != pid:
+                # Rows inherited from the parent belong to the parent's thread;
+                # waiting on them here would never finish.
+                self._queue = queue.Queue(maxsize=self.max_pending)
+            self._worker = threading.Thread(
+                target=self._run,
+                name=f"write-behind-{self.model.__name__}",
+                daemon=True,
+            )
+            self._worker_pid = pid
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            taken = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(taken) < self.batch_size and taken[-1] is not _FLUSH:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    taken.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                self._write([obj for obj in taken if obj is not _FLUSH])
+            finally:
+                for _ in taken:
+                    self._queue.task_done()
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            self.model.objects.bulk_create(batch, batch_size=self.batch_size)
+        except DatabaseError:
+            logger.exception("Failed to write %d %s rows", len(batch), self.model.__name__)
+            return
+        if self.on_flush is not None:
+            self.on_flush(batch)
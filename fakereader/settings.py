@@ -29,7 +29,12 @@ ALLOWED_HOSTS = [
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': (
         'rest_framework.renderers.JSONRenderer',  # Only JSON, no browsable API
-    )
+    ),
+    # Review POSTs per client IP (detector.views.ReviewPostThrottle). Counts
+    # live in the default cache, so with LocMem each worker counts its own.
+    'DEFAULT_THROTTLE_RATES': {
+        'reviews': '30/minute',
+    },
 }
 
 INSTALLED_APPS = [
@@ -74,19 +79,37 @@ TEMPLATES = [
 WSGI_APPLICATION = 'fakereader.wsgi.application'
 
 # Database configuration
+# CONN_MAX_AGE keeps each worker's connection open between requests, and
+# IMMEDIATE transactions take the write lock up front so concurrent writers
+# queue on busy_timeout instead of failing mid-transaction. The lock wait
+# itself (busy_timeout) and the other PRAGMAs are set on every new
+# connection by detector/sqlite_tuning.py; add SQLITE_PRAGMAS here only to
+# override individual values.
+SQLITE_OPTIONS = {
+    'transaction_mode': 'IMMEDIATE',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # SQLITE_PATH / NEWS_DB_PATH point a process at other files (tests, load tests)
+        'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': SQLITE_OPTIONS,
     },
+    # Scraped corpus (news_table), shared with the scraper and model training
     'news_db': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'news.db',
+        'NAME': os.environ.get('NEWS_DB_PATH', BASE_DIR / 'ml_artifacts' / 'news.db'),
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': SQLITE_OPTIONS,
     }
 }
 
-# Optional: database router if using multiple DBs
-#DATABASE_ROUTERS = ['detector.db_routers.NewsRouter']
+# Routes the NewsArticle corpus to news_db, everything else to default
+DATABASE_ROUTERS = ['detector.db_routers.NewsRouter']
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -121,3 +144,55 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Background batching of prediction history, review and shadow writes
+# (detector/write_behind.py)
+WRITE_BEHIND = {
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 1.0,  # seconds to wait for a batch to fill
+    # Beyond this, put() refuses the row instead of blocking the request:
+    # history rows are then skipped, reviews are saved synchronously.
+    'MAX_PENDING': 10000,
+}
+
+# Shadow evaluation (detector/shadow.py): workers store a sample of live
+# predictions (ShadowSample) after the response is sent; one separate
+# manage.py shadow_score --loop process scores them with the candidate and
+# writes ShadowPrediction for manage.py shadow_report. Workers never load
+# the candidate.
+SHADOW_MODEL = {
+    'ARTIFACT': os.environ.get('SHADOW_MODEL_ARTIFACT', ''),  # path to a candidate .pkl; empty disables
+    'SAMPLE_RATE': 0.1,
+    'MAX_PENDING': 1000,  # samples waiting for the write-behind buffer; beyond this they are dropped
+}
+
+# Drift statistics kept on the request path (detector/monitoring.py) and
+# served at /monitoring/stats/ to staff or to GETs sending TOKEN in an
+# X-Monitoring-Token header: the last WINDOWS windows of WINDOW_SECONDS, per
+# worker process. Each call answers for one worker only, so anything that
+# acts on drift (e.g. retraining) must first collect every worker's pid and
+# sum their windows; one worker's view is a fraction of the traffic.
+MONITORING = {
+    'WINDOW_SECONDS': 300,
+    'WINDOWS': 12,
+    'TOKEN': os.environ.get('MONITORING_TOKEN', ''),  # empty: staff sessions only
+}
+
+# Per-source polling for the scrape_sources command (detector/scrape_scheduler.py)
+SCRAPE_SCHEDULE = {
+    'MIN_INTERVAL': 600,     # seconds; busiest sources are polled this often
+    'MAX_INTERVAL': 86400,   # quietest sources are still polled daily
+    'TARGET_YIELD': 5,       # new articles per fetch the interval is tuned towards
+    'MAX_STEP': 2.0,         # largest factor the interval moves by in one fetch
+    'RETRY_BASE': 300,       # first retry delay after a failure, doubled per failure
+    'JITTER': 0.1,           # +/- fraction added to due times to spread fetches out
+    'WORKERS': 8,
+}
+
+# Review API pages are cached here and invalidated on write. LocMem is per
+# worker, so other workers may serve a page up to REVIEW_CACHE_TTL stale;
+# point this at a shared backend to make invalidation global.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
@@ -0,0 +1,155 @@
+# scripts/bench_sqlite.py
+# Run from the project root folder:
+#   python scripts/bench_sqlite.py [--writers 4] [--readers 4] [--seconds 5]
+#
+# Concurrent write/read benchmark for the SQLite settings in fakereader/settings.py.
+# Each writer/reader is a separate process, like gunicorn workers. "stock"
+# reopens the database for every operation with SQLite defaults (what each
+# request did before); "tuned" keeps one connection per process and applies
+# detector.sqlite_tuning.DEFAULT_PRAGMAS. Works on a temp copy, never on the
+# real databases.
+
+import argparse
+import multiprocessing as mp
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from detector.sqlite_tuning import DEFAULT_PRAGMAS, apply_pragmas
+
+SEED_ROWS = 5000
+REVIEW_TEXT = "Useful tool, the confidence bar helps a lot. " * 3
+
+
+def setup_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE detector_review (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name varchar(100) NOT NULL,
+            review text NOT NULL,
+            created_at datetime NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX review_created_idx ON detector_review (created_at DESC, id DESC)")
+    conn.executemany(
+        "INSERT INTO detector_review (name, review, created_at) VALUES (?, ?, datetime('now'))",
+        [("seed", REVIEW_TEXT)] * SEED_ROWS,
+    )
+    conn.commit()
+    conn.close()
+
+
+def connect(path, tuned):
+    # Django's sqlite backend waits 5 s on a lock by default, same as sqlite3.
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+    if tuned:
+        apply_pragmas(conn.cursor(), DEFAULT_PRAGMAS)
+    return conn
+
+
+def write_op(conn, tuned):
+    # Tuned mode mirrors transaction_mode=IMMEDIATE in settings.
+    conn.execute("BEGIN IMMEDIATE" if tuned else "BEGIN")
+    conn.execute(
+        "INSERT INTO detector_review (name, review, created_at) VALUES (?, ?, datetime('now'))",
+        ("bench", REVIEW_TEXT),
+    )
+    conn.execute("COMMIT")
+
+
+def read_op(conn, tuned):
+    conn.execute(
+        "SELECT id, name, review, created_at FROM detector_review "
+        "ORDER BY created_at DESC, id DESC LIMIT 20"
+    ).fetchall()
+
+
+def worker(path, tuned, kind, seconds, results):
+    op = write_op if kind == "write" else read_op
+    latencies, errors = [], 0
+    conn = connect(path, tuned) if tuned else None
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            if tuned:
+                op(conn, tuned)
+            else:
+                per_request = connect(path, tuned)
+                try:
+                    op(per_request, tuned)
+                finally:
+                    per_request.close()
+        except sqlite3.OperationalError:
+            errors += 1
+            if tuned and conn.in_transaction:
+                conn.execute("ROLLBACK")
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    if conn is not None:
+        conn.close()
+    results.put((kind, latencies, errors))
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(mode, writers, readers, seconds):
+    tuned = mode == "tuned"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite3")
+        setup_db(path)
+        if tuned:
+            # journal_mode=WAL is persistent, set it once before workers start.
+            conn = connect(path, tuned=True)
+            conn.close()
+
+        results = mp.Queue()
+        procs = [mp.Process(target=worker, args=(path, tuned, "write", seconds, results)) for _ in range(writers)]
+        procs += [mp.Process(target=worker, args=(path, tuned, "read", seconds, results)) for _ in range(readers)]
+        for p in procs:
+            p.start()
+        collected = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+    print(f"\n[{mode}] {writers} writers, {readers} readers, {seconds}s")
+    for kind in ("write", "read"):
+        latencies = [l for k, ls, _ in collected if k == kind for l in ls]
+        errors = sum(e for k, _, e in collected if k == kind)
+        ops = len(latencies)
+        print(
+            f"  {kind:<5} ops/s={ops / seconds:>9.1f}  locked_errors={errors:<5} "
+            f"p50={statistics.median(latencies) if latencies else float('nan'):.2f}ms  "
+            f"p99={percentile(latencies, 99):.2f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent SQLite write/read benchmark")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--mode", choices=["stock", "tuned", "both"], default="both")
+    args = parser.parse_args()
+
+    modes = ["stock", "tuned"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        run(mode, args.writers, args.readers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# scripts/corpus_memory.py
+# Run from the project root folder:
+#   python scripts/corpus_memory.py [--rows 4900 1000000]
+#
+# Compares the per-worker memory of the old in-memory corpus (the pickled
+# DataFrame with text, cleaned_text, label and article_url object columns)
+# with detector.corpus_store.CompactCorpus. Larger sizes are synthesized by
+# repeating the real news_table rows with unique URLs and text. Each
+# representation is pickled by one process and unpickled by a fresh one,
+# which reports its RSS growth: what a serving worker pays after get_model().
+
+import argparse
+import gc
+import multiprocessing as mp
+import os
+import pickle
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+MODEL_FILE = os.path.join(PROJECT_ROOT, "ml_artifacts", "model_state.pkl")
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def load_base():
+    import django
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "fakereader.settings")
+    django.setup()
+
+    from detector.model_training import load_dataset
+
+    with open(MODEL_FILE, "rb") as f:
+        artifact = pickle.load(f)
+    vectorizer = artifact[1] if isinstance(artifact, tuple) else artifact["vectorizer"]
+    return load_dataset(), vectorizer
+
+
+def scaled_rows(df, rows):
+    reps = -(-rows // len(df))
+    texts, cleaned, labels, urls = [], [], [], []
+    for rep in range(reps):
+        for text, clean, label, url in zip(df["text"], df["cleaned_text"], df["label"], df["article_url"]):
+            if len(urls) == rows:
+                break
+            # Fresh string objects, as rows loaded from the database would be.
+            texts.append(f"{text} {rep}")
+            cleaned.append(f"{clean} {rep}")
+            labels.append(f"{label}")
+            urls.append(f"{url}#{rep}")
+    return texts, cleaned, labels, urls
+
+
+def build(kind, rows, path):
+    import pandas as pd
+    import scipy.sparse as sp
+    from detector.corpus_store import CompactCorpus
+
+    df, vectorizer = load_base()
+    texts, cleaned, labels, urls = scaled_rows(df, rows)
+
+    if kind == "dataframe":
+        kept = pd.DataFrame({"text": texts, "label": labels, "article_url": urls, "cleaned_text": cleaned})
+    else:
+        reps = -(-rows // len(df))
+        vectors = sp.vstack([vectorizer.transform(df["cleaned_text"])] * reps, format="csr")[:rows]
+        kept = CompactCorpus.build(urls, labels, vectors)
+
+    with open(path, "wb") as f:
+        pickle.dump(kept, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def measure(path, results):
+    import pandas  # noqa: F401  (imported before the baseline, as in a worker)
+    import scipy.sparse  # noqa: F401
+    import detector.corpus_store  # noqa: F401
+
+    gc.collect()
+    before = rss_mb()
+    with open(path, "rb") as f:
+        kept = pickle.load(f)
+    gc.collect()
+    results.put(rss_mb() - before)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Corpus memory: DataFrame vs CompactCorpus")
+    parser.add_argument("--rows", type=int, nargs="+", default=[4900, 1000000])
+    args = parser.parse_args()
+
+    results = mp.Queue()
+    print(f"{'rows':>10}  {'representation':<15} {'pickle':>10} {'worker RSS':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            for kind in ("dataframe", "compact"):
+                path = os.path.join(tmp, f"{kind}-{rows}.pkl")
+                for target, target_args in ((build, (kind, rows, path)), (measure, (path, results))):
+                    proc = mp.Process(target=target, args=target_args)
+                    proc.start()
+                    proc.join()
+                growth = results.get()
+                size = os.path.getsize(path) / (1 << 20)
+                print(f"{rows:>10}  {kind:<15} {size:>7.1f} MB {growth:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
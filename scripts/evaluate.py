@@ -1,15 +1,23 @@
 # scripts/evaluate.py
 # Run from the project root folder:
 #   python scripts/evaluate.py
+#   python scripts/evaluate.py --features [--report ml_artifacts/feature_report]
+#   python scripts/evaluate.py --snapshot latest
 #
 # Compares class_weight strategies on the same train/test split so you can
 # pick whichever gives the best fake-class recall/precision for your resume.
+# With --features, sweeps the feature-reduction settings in
+# detector.model_training.FEATURE_CONFIG instead and reports vocabulary size
+# against accuracy, artifact size and p99 single-request latency, written as
+# <report>.csv, plus a <report>.png plot when matplotlib is installed
+# (pip install -r requirements-eval.txt).
 # Does NOT overwrite model_state.pkl.
 
+import argparse
+import csv
 import os
-import sqlite3
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+import pickle
+import time
 from sklearn.svm import SVC
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import (
@@ -21,18 +29,27 @@ import sys
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
-from detector.model_training import preprocess_text
-
-DB_FILE = os.path.join(PROJECT_ROOT, "ml_artifacts", "news.db")
-RANDOM_STATE = 42  # fixed so results are reproducible run-to-run
+import django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "fakereader.settings")
+django.setup()
 
+from detector.model_training import load_dataset, build_vectorizer, n_features
 
-def load_dataset():
-    conn = sqlite3.connect(DB_FILE)
-    df = pd.read_sql_query("SELECT text, label, article_url FROM news_table", conn)
-    conn.close()
-    df["cleaned_text"] = df["text"].apply(preprocess_text)
-    return df
+RANDOM_STATE = 42  # fixed so results are reproducible run-to-run
+LATENCY_SAMPLES = 300
+
+# Operating points for --features (merged over FEATURE_CONFIG)
+FEATURE_SWEEP = [
+    ("full vocabulary", {"min_df": 1}),
+    ("min_df=2", {"min_df": 2}),
+    ("min_df=3, max_df=0.5", {"min_df": 3, "max_df": 0.5}),
+    ("max_features=10000", {"min_df": 1, "max_features": 10000}),
+    ("min_df=2 + chi2 k=5000", {"min_df": 2, "selector": "chi2", "k": 5000}),
+    ("min_df=2 + chi2 k=2000", {"min_df": 2, "selector": "chi2", "k": 2000}),
+    ("min_df=2 + chi2 k=1000", {"min_df": 2, "selector": "chi2", "k": 1000}),
+    ("min_df=2 + l1 k=2000", {"min_df": 2, "selector": "l1", "k": 2000}),
+    ("hashing 2^14", {"hashing": True, "hash_bits": 14}),
+]
 
 
 def run_config(name, class_weight, X_train_vec, X_test_vec, y_train, y_test):
@@ -67,12 +84,99 @@ def run_config(name, class_weight, X_train_vec, X_test_vec, y_train, y_test):
     return {"name": name, "accuracy": acc, "fake_f1": f1, "weighted_f1": weighted_f1}
 
 
+def run_feature_config(name, config, X_train, X_test, y_train, y_test):
+    vectorizer = build_vectorizer(config)
+    X_train_vec = vectorizer.fit_transform(X_train, y_train)
+    X_test_vec = vectorizer.transform(X_test)
+
+    model = SVC(probability=True, class_weight={"fake": 3, "real": 1}, random_state=RANDOM_STATE)
+    model.fit(X_train_vec, y_train)
+    y_pred = model.predict(X_test_vec)
+
+    # One request = transform one text + predict + predict_proba, as in predict_news
+    latencies = []
+    for text in list(X_test)[:LATENCY_SAMPLES]:
+        start = time.perf_counter()
+        vec = vectorizer.transform([text])
+        model.predict(vec)
+        model.predict_proba(vec)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    row = {
+        "name": name,
+        "vocabulary": n_features(vectorizer),
+        "accuracy": accuracy_score(y_test, y_pred),
+        "fake_f1": f1_score(y_test, y_pred, pos_label="fake"),
+        "artifact_kb": len(pickle.dumps((vectorizer, model))) / 1024,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+    print(f"{name:<26} vocab={row['vocabulary']:>7}  acc={row['accuracy']:.4f}  "
+          f"fake_f1={row['fake_f1']:.4f}  artifact={row['artifact_kb']:>8.0f} KB  p99={row['p99_ms']:.2f} ms")
+    return row
+
+
+def plot_feature_report(rows, path):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib not installed, skipping plot (pip install -r requirements-eval.txt)")
+        return
+
+    fig, axes = plt.subplots(1, 3, figsize=(15, 4))
+    for ax, key, title in zip(axes, ["accuracy", "artifact_kb", "p99_ms"],
+                              ["Accuracy", "Artifact size (KB)", "p99 latency (ms)"]):
+        for row in rows:
+            ax.scatter(row["vocabulary"], row[key])
+            ax.annotate(row["name"], (row["vocabulary"], row[key]), fontsize=7)
+        ax.set_xscale("log")
+        ax.set_xlabel("Vocabulary size (features)")
+        ax.set_title(title)
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    print(f"Plot written to {path}")
+
+
+def feature_report(df, report_path):
+    X_train, X_test, y_train, y_test = train_test_split(
+        df["cleaned_text"], df["label"], test_size=0.2, random_state=RANDOM_STATE, stratify=df["label"]
+    )
+
+    print("\n" + "=" * 60)
+    print("FEATURE REDUCTION SWEEP")
+    print("=" * 60)
+    rows = [run_feature_config(name, config, X_train, X_test, y_train, y_test)
+            for name, config in FEATURE_SWEEP]
+
+    with open(report_path + ".csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\nReport written to {report_path}.csv")
+    plot_feature_report(rows, report_path + ".png")
+
+
 def main():
-    print("Loading dataset...")
-    df = load_dataset()
+    parser = argparse.ArgumentParser(description="Offline model evaluation")
+    parser.add_argument("--features", action="store_true",
+                        help="Sweep feature-reduction settings instead of class weights")
+    parser.add_argument("--report", default=os.path.join(PROJECT_ROOT, "ml_artifacts", "feature_report"),
+                        help="Output path (without extension) for the --features report")
+    parser.add_argument("--snapshot", default=None,
+                        help='Read a news_table snapshot ("latest", a version or a path) instead of the database')
+    args = parser.parse_args()
+
+    print("Loading dataset..." if not args.snapshot else f"Loading snapshot {args.snapshot}...")
+    df = load_dataset(args.snapshot)
     print(f"Total rows: {len(df)}")
     print(df["label"].value_counts())
 
+    if args.features:
+        feature_report(df, args.report)
+        return
+
     X_text = df["cleaned_text"]
     y = df["label"]
 
@@ -81,8 +185,8 @@ def main():
     )
     print(f"\nTrain size: {len(X_train)}  |  Test size: {len(X_test)}")
 
-    vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2))
-    X_train_vec = vectorizer.fit_transform(X_train)
+    vectorizer = build_vectorizer()
+    X_train_vec = vectorizer.fit_transform(X_train, y_train)
     X_test_vec = vectorizer.transform(X_test)
 
     results = []
@@ -1,41 +1,16 @@
 # generating_db_dynamic_news_scraper.py
 
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from datetime import datetime, timezone
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import sqlite3
-import time
-import re
-import html
+import sys
 import os
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
 
-# ---------------- SOURCES ----------------
-real_sources = [
-    "https://www.hindustantimes.com/",
-    "https://www.indiatoday.in/",
-    "https://www.ndtv.com/latest",
-    "https://www.dnaindia.com/",
-    "https://www.bhaskar.com/",
-    "https://timesofindia.indiatimes.com/",
-    "https://www.reuters.com/world/",
-    "https://www.bbc.com/news"
-]
-
-fake_sources = [
-    "https://www.altnews.in/fake-news/",
-    "https://www.boomlive.in/fact-check/",
-    "https://www.factchecker.in/",
-    "https://www.thequint.com/webqoof",
-    "https://www.indiatoday.in/fact-check",
-    "https://factcheck.pib.gov.in/",
-    "https://www.vishvasnews.com/english/",
-    "https://newschecker.in/",
-    "https://www.factcrescendo.com/",
-    "https://www.politifact.com/factchecks/",
-    "https://fullfact.org/"
-]
+# Sources, cleaning and parsing are shared with the scrape_sources scheduler;
+# this script is a one-shot pass over every seed source.
+from detector.scraping import REAL_SOURCES, FAKE_SOURCES, scrape_url, source_host
 
 # ---------------- DATABASE SETUP ----------------
 conn = sqlite3.connect(os.path.join(PROJECT_ROOT, "ml_artifacts", "news.db"))
@@ -45,62 +20,21 @@ CREATE TABLE IF NOT EXISTS news_table (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     text TEXT,
     label TEXT,
-    article_url TEXT UNIQUE
+    article_url TEXT UNIQUE,
+    source_host varchar(200) NOT NULL DEFAULT '',
+    inserted_at datetime NULL
 )
 """)
+# An existing table keeps its old schema under IF NOT EXISTS; add the columns
+# the inserts below need, as migration 0004 does (migrate --database news_db
+# also adds the indexes and backfills source_host).
+columns = {row[1] for row in cursor.execute("PRAGMA table_info(news_table)")}
+if "source_host" not in columns:
+    cursor.execute("ALTER TABLE news_table ADD COLUMN source_host varchar(200) NOT NULL DEFAULT ''")
+if "inserted_at" not in columns:
+    cursor.execute("ALTER TABLE news_table ADD COLUMN inserted_at datetime NULL")
 conn.commit()
 
-# ---------------- TEXT CLEANING ----------------
-def clean_text(text):
-    text = html.unescape(text)
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-    text = text.lower()
-    return text
-
-# ---------------- HEADLINE QUALITY FILTER ----------------
-SKIP_PHRASES = {
-    "subscribe", "read more", "click here", "sign in", "log in",
-    "home", "about us", "contact us", "privacy policy", "terms of use",
-    "terms and conditions", "correction policy", "grievance redressal"
-}
-
-def is_valid_headline(title):
-    if len(title) < 25:
-        return False
-    if title.lower() in SKIP_PHRASES:
-        return False
-    return True
-
-# ---------------- SCRAPER ----------------
-def scrape_url(url, label, retries=3, delay=2):
-    articles = []
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Connection": "keep-alive"
-    }
-
-    for attempt in range(retries):
-        try:
-            resp = requests.get(url, headers=headers, timeout=8)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.content, "html.parser")
-            for link in soup.find_all("a", href=True):
-                title = clean_text(link.get_text())
-                if not is_valid_headline(title):
-                    continue
-                href = link["href"]
-                full_url = href if href.startswith("http") else urljoin(url, href)
-                articles.append({"text": title, "label": label, "article_url": full_url})
-            return articles
-        except requests.exceptions.RequestException as e:
-            print(f"[WARN] Attempt {attempt+1} failed for {url} -> {e}")
-            time.sleep(delay)
-    print(f"[ERROR] Skipping URL due to repeated failures: {url}")
-    return articles
-
 # ---------------- DYNAMIC SCRAPING ----------------
 def scrape_all(sources, label, max_workers=8):
     all_articles = []
@@ -114,12 +48,14 @@ def scrape_all(sources, label, max_workers=8):
 # ---------------- DATABASE INSERTION ----------------
 def insert_articles_to_db(articles):
     count = 0
+    inserted_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
     for article in articles:
         try:
             cursor.execute("""
-            INSERT OR IGNORE INTO news_table (text, label, article_url)
-            VALUES (?, ?, ?)
-            """, (article['text'], article['label'], article['article_url']))
+            INSERT OR IGNORE INTO news_table (text, label, article_url, source_host, inserted_at)
+            VALUES (?, ?, ?, ?, ?)
+            """, (article['text'], article['label'], article['article_url'],
+                  source_host(article['article_url']), inserted_at))
             count += 1
         except Exception as e:
             print(f"[ERROR] Could not insert article: {article['article_url']} -> {e}")
@@ -129,9 +65,9 @@ def insert_articles_to_db(articles):
 # ---------------- MAIN ----------------
 def main():
     print("Scraping REAL news sources...")
-    real_articles = scrape_all(real_sources, "real")
+    real_articles = scrape_all(REAL_SOURCES, "real")
     print("Scraping FAKE news sources...")
-    fake_articles = scrape_all(fake_sources, "fake")
+    fake_articles = scrape_all(FAKE_SOURCES, "fake")
 
     all_articles = real_articles + fake_articles
     unique_articles = {a['article_url']: a for a in all_articles}.values()
@@ -0,0 +1,438 @@
+# scripts/loadtest.py
+# Run from the project root folder:
+#   python scripts/loadtest.py [--workers 2] [--threads 4] [--rate 20] [--duration 60]
+#   python scripts/loadtest.py --url http://127.0.0.1:8000   # an already running server
+#
+# Starts fakereader.wsgi under gunicorn on migrated copies of db.sqlite3 and
+# ml_artifacts/news.db and replays a mix of home page views, check_news
+# calls (part of them drawn from a small set of repeated "viral" texts) and
+# review posts. Arrivals are open-loop: Poisson at --rate requests/s however
+# slowly the server answers, and latency is measured from each request's
+# scheduled start, so queueing shows up instead of being hidden. Reports
+# throughput, latency percentiles and errors per endpoint and the RSS of
+# every gunicorn worker (sampled from /proc).
+#
+# The copies, with every review, prediction and shadow row the run wrote,
+# are deleted afterwards, so load test that way. Against --url the rows land
+# in that server's database and stay there: prediction history cannot be
+# told apart from real traffic. Reviews are named "loadtest-<run id>", and
+# --cleanup deletes this run's reviews, only for a loopback --url and from
+# the database SQLITE_PATH (default db.sqlite3) names.
+# Needs gunicorn (requirements.txt) unless --url is given.
+
+import argparse
+import http.client
+import ipaddress
+import http.cookies
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The app's databases, honouring the same overrides as fakereader/settings.py
+NEWS_DB = os.environ.get("NEWS_DB_PATH", os.path.join(PROJECT_ROOT, "ml_artifacts", "news.db"))
+DEFAULT_DB = os.environ.get("SQLITE_PATH", os.path.join(PROJECT_ROOT, "db.sqlite3"))
+
+REVIEW_PREFIX = "loadtest"
+TEXT_SAMPLE = 5000
+VIRAL_TEXTS = 20
+FALLBACK_TEXTS = [
+    "Government announces new budget for schools in Delhi",
+    "Scientists confirm drinking hot water cures all viral infections",
+    "Stock market falls sharply amid global tension",
+    "Aliens built the pyramids, new study claims",
+]
+REVIEWS = [
+    "Useful tool, the confidence bar helps a lot.",
+    "Flagged a forward from my family group correctly.",
+    "Would like to see more sources listed.",
+]
+
+
+# WORKLOAD
+def load_texts(limit=TEXT_SAMPLE):
+    """
+    Headlines sampled from news_table, read-only; the fallback list if the
+    corpus is unavailable.
+    """
+    try:
+        conn = sqlite3.connect(f"file:{NEWS_DB}?mode=ro", uri=True)
+        rows = conn.execute(
+            "SELECT text FROM news_table WHERE text IS NOT NULL ORDER BY random() LIMIT ?", (limit,)
+        ).fetchall()
+        conn.close()
+    except sqlite3.Error:
+        rows = []
+    return [row[0] for row in rows] or FALLBACK_TEXTS
+
+
+class Workload:
+    def __init__(self, texts, mix, viral_share, rng, review_name=REVIEW_PREFIX):
+        self.texts = texts
+        self.review_name = review_name
+        self.viral = texts[:VIRAL_TEXTS]
+        self.viral_share = viral_share
+        self.kinds = list(mix)
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.rng = rng
+
+    def next_request(self):
+        """
+        (endpoint name, method, path, form data or None)
+        """
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        if kind == "home":
+            return kind, "GET", "/", None
+        if kind == "review":
+            return kind, "POST", "/submit_review/", {"name": self.review_name, "review": self.rng.choice(REVIEWS)}
+
+        # Viral texts follow a Zipf-like skew, so a handful dominate.
+        if self.rng.random() < self.viral_share:
+            rank = min(int(self.rng.paretovariate(1.2)) - 1, len(self.viral) - 1)
+            text = self.viral[rank]
+        else:
+            text = self.rng.choice(self.texts)
+        return kind, "POST", "/check_news/", {"news_text": text}
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in ("home", "check", "review"):
+            raise argparse.ArgumentTypeError(f"unknown request kind {kind!r}")
+        mix[kind] = float(weight)
+    return mix
+
+
+# HTTP CLIENT (one keep-alive connection per client thread)
+class Client:
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.csrf_token = ""
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def request(self, method, path, form=None):
+        """
+        Returns (status, body, Set-Cookie header). Reconnects once if the server closed the
+        keep-alive connection.
+        """
+        headers = {}
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+            headers["X-CSRFToken"] = self.csrf_token
+            headers["Cookie"] = f"csrftoken={self.csrf_token}"
+
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                return resp.status, resp.read(), resp.getheader("Set-Cookie", "")
+            except (OSError, http.client.HTTPException) as e:
+                # A failed connection cannot be reused, whatever the error.
+                conn.close()
+                self._local.conn = None
+                stale = isinstance(e, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError))
+                if attempt or not stale:
+                    raise
+
+    def fetch_csrf_token(self):
+        _, _, set_cookie = self.request("GET", "/")
+        cookie = http.cookies.SimpleCookie(set_cookie)
+        if "csrftoken" not in cookie:
+            raise RuntimeError("Home page did not set a csrftoken cookie")
+        self.csrf_token = cookie["csrftoken"].value
+
+
+# SERVER
+def copy_databases(directory):
+    """
+    Copy both databases into ``directory`` (sqlite3 backups, so a live WAL
+    is included), migrate the copies and return the environment that points
+    the app at them.
+    """
+    env = {
+        "SQLITE_PATH": os.path.join(directory, "db.sqlite3"),
+        "NEWS_DB_PATH": os.path.join(directory, "news.db"),
+    }
+    for source, target in ((DEFAULT_DB, env["SQLITE_PATH"]), (NEWS_DB, env["NEWS_DB_PATH"])):
+        if os.path.exists(source):
+            src, dst = sqlite3.connect(source), sqlite3.connect(target)
+            src.backup(dst)
+            src.close()
+            dst.close()
+
+    env = {**os.environ, **env}
+    manage_py = os.path.join(PROJECT_ROOT, "manage.py")
+    for database in ("default", "news_db"):
+        subprocess.run([sys.executable, manage_py, "migrate", "--database", database, "-v", "0", "--skip-checks"],
+                       cwd=PROJECT_ROOT, env=env, check=True)
+    return env
+
+
+def start_gunicorn(bind, workers, threads, preload, env):
+    command = [
+        sys.executable, "-m", "gunicorn", "fakereader.wsgi:application",
+        "--bind", bind, "--workers", str(workers), "--threads", str(threads),
+        "--log-level", "warning",
+    ]
+    if preload:
+        command.append("--preload")
+    return subprocess.Popen(command, cwd=PROJECT_ROOT, env=env)
+
+
+def wait_until_ready(client, server, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {server.returncode}")
+        try:
+            client.fetch_csrf_token()
+            return
+        except (OSError, http.client.HTTPException, RuntimeError):
+            time.sleep(0.5)
+    raise RuntimeError(f"Server not ready after {timeout}s")
+
+
+def worker_pids(master_pid):
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The ppid is the 2nd field after the parenthesised command name.
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == master_pid:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class RssSampler(threading.Thread):
+    """
+    Samples master and worker RSS once a second; keeps the peak and last
+    value per pid.
+    """
+
+    def __init__(self, master_pid, interval=1.0):
+        super().__init__(daemon=True)
+        self.master_pid = master_pid
+        self.interval = interval
+        self.peak, self.last = {}, {}
+        self._done = threading.Event()
+
+    def sample(self):
+        for pid in [self.master_pid] + worker_pids(self.master_pid):
+            value = rss_mb(pid)
+            if value is not None:
+                self.last[pid] = value
+                self.peak[pid] = max(self.peak.get(pid, 0), value)
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._done.set()
+        self.sample()
+
+
+# RUN
+def run_load(client, workload, rate, duration, concurrency, rng):
+    """
+    Open-loop run: arrivals are scheduled up front from the Poisson process
+    and submitted on time; a request that waits for a free client thread
+    still counts its latency from the scheduled time.
+    """
+    results = []  # (kind, scheduled, started, finished, ok)
+    lock = threading.Lock()
+
+    def send(kind, method, path, form, scheduled):
+        started = time.perf_counter()
+        try:
+            status, body, _ = client.request(method, path, form)
+            ok = status < 400 and (kind != "check" or b'"success": true' in body)
+        except (OSError, http.client.HTTPException):
+            ok = False
+        finished = time.perf_counter()
+        with lock:
+            results.append((kind, scheduled, started, finished, ok))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        next_at = start
+        while True:
+            next_at += rng.expovariate(rate)
+            if next_at - start >= duration:
+                break
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, *workload.next_request(), next_at)
+
+    return results, time.perf_counter() - start
+
+
+def report(results, offered_rate, wall_seconds):
+    print(f"\nOffered {offered_rate:.1f} req/s; {len(results)} requests completed in {wall_seconds:.1f}s")
+    print(f"{'endpoint':<10} {'count':>7} {'req/s':>8} {'err%':>6} {'p50':>8} {'p90':>8} "
+          f"{'p99':>8} {'max':>8} {'queue p99':>10}   (ms)")
+
+    for kind in sorted({row[0] for row in results}) + ["all"]:
+        rows = [row for row in results if kind == "all" or row[0] == kind]
+        if not rows:
+            continue
+        latency = np.array([(row[3] - row[1]) * 1000 for row in rows])
+        queued = np.array([max(row[2] - row[1], 0) * 1000 for row in rows])
+        errors = sum(1 for row in rows if not row[4])
+        p50, p90, p99 = np.percentile(latency, [50, 90, 99])
+        print(f"{kind:<10} {len(rows):>7} {len(rows) / wall_seconds:>8.1f} {errors / len(rows):>6.1%} "
+              f"{p50:>8.1f} {p90:>8.1f} {p99:>8.1f} {latency.max():>8.1f} {np.percentile(queued, 99):>10.1f}")
+
+
+def report_rss(sampler):
+    print("\nRSS (MB)      peak     last")
+    for pid in sorted(sampler.peak, key=lambda pid: (pid != sampler.master_pid, pid)):
+        role = "master" if pid == sampler.master_pid else "worker"
+        print(f"{role} {pid:<7} {sampler.peak[pid]:>7.1f}  {sampler.last[pid]:>7.1f}")
+    workers = [sampler.peak[pid] for pid in sampler.peak if pid != sampler.master_pid]
+    if workers:
+        print(f"workers total peak {sum(workers):.1f} MB")
+
+
+def is_loopback(url):
+    host = urlsplit(url).hostname or ""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def cleanup_reviews(review_name, accepted, timeout=30):
+    """
+    Delete this run's reviews from DEFAULT_DB. The server is still running
+    and writes reviews behind, so this keeps deleting until all ``accepted``
+    reviews have been seen or ``timeout`` seconds pass. Prediction history is
+    left alone: it cannot be told apart from real traffic.
+    """
+    deleted = 0
+    deadline = time.monotonic() + timeout
+    conn = sqlite3.connect(DEFAULT_DB, timeout=20)
+    while True:
+        with conn:
+            deleted += conn.execute("DELETE FROM detector_review WHERE name = ?", (review_name,)).rowcount
+        if deleted >= accepted or time.monotonic() >= deadline:
+            break
+        time.sleep(0.5)
+    conn.close()
+    if deleted < accepted:
+        print(f"Only {deleted} of {accepted} accepted reviews reached {DEFAULT_DB} within {timeout}s.")
+    print(f"Deleted {deleted} {review_name!r} reviews from {DEFAULT_DB}. Predictions written by the run "
+          f"were kept; run without --url to load test migrated copies instead.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load test of the full Django stack")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=1, help="gunicorn threads per worker")
+    parser.add_argument("--preload", action="store_true", help="gunicorn --preload (import the app before forking)")
+    parser.add_argument("--bind", default="127.0.0.1:8765")
+    parser.add_argument("--url", default=None, help="Load an already running server instead of starting gunicorn")
+    parser.add_argument("--rate", type=float, default=20, help="Mean arrivals per second (Poisson)")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds of unmeasured load first")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("home=0.2,check=0.7,review=0.1"),
+                        help="Relative weights of home, check and review requests")
+    parser.add_argument("--viral-share", type=float, default=0.3,
+                        help="Fraction of check requests drawn from the repeated viral texts")
+    parser.add_argument("--concurrency", type=int, default=64, help="Most requests in flight")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cleanup", action="store_true",
+                        help="With a loopback --url: delete this run's reviews from SQLITE_PATH (db.sqlite3)")
+    args = parser.parse_args()
+    if args.cleanup and not (args.url and is_loopback(args.url)):
+        parser.error("--cleanup needs a loopback --url whose server uses this checkout's database "
+                     "(SQLITE_PATH); without --url the run uses copies that are discarded anyway")
+
+    rng = random.Random(args.seed)
+    texts = load_texts()
+    rng.shuffle(texts)
+    review_name = f"{REVIEW_PREFIX}-{uuid.uuid4().hex[:12]}"
+    workload = Workload(texts, args.mix, args.viral_share, rng, review_name)
+
+    copies = None if args.url else tempfile.TemporaryDirectory(prefix="loadtest-")
+    server = None
+    client = Client(args.url or f"http://{args.bind}", args.timeout)
+    sampler = None
+    warmup_results, results = [], []
+    try:
+        if copies is not None:
+            env = copy_databases(copies.name)
+            server = start_gunicorn(args.bind, args.workers, args.threads, args.preload, env)
+        wait_until_ready(client, server)
+        if server is not None:
+            sampler = RssSampler(server.pid)
+            sampler.start()
+            print(f"gunicorn {server.pid}: {args.workers} workers x {args.threads} threads on {args.bind}")
+
+        if args.warmup > 0:
+            print(f"Warming up for {args.warmup:.0f}s...")
+            warmup_results, _ = run_load(client, workload, args.rate, args.warmup, args.concurrency, rng)
+
+        print(f"Measuring {args.rate:.1f} req/s for {args.duration:.0f}s...")
+        results, wall_seconds = run_load(client, workload, args.rate, args.duration, args.concurrency, rng)
+        report(results, args.rate, wall_seconds)
+        if sampler is not None:
+            sampler.stop()
+            report_rss(sampler)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if copies is not None:
+            copies.cleanup()
+
+    if args.cleanup:
+        accepted = sum(1 for row in warmup_results + results if row[0] == "review" and row[4])
+        cleanup_reviews(review_name, accepted)
+
+
+if __name__ == "__main__":
+    main()